@@ -1,15 +1,18 @@
 import os
+import re
 from setuptools import setup
 from setuptools import find_packages
 
 
-__version__ = None
-with open("src/wetransfer/version.py", "r") as f:
-    exec(f.read())
-
 # Allow setup.py to be run from any path
 os.chdir(os.path.normpath(os.path.join(os.path.abspath(__file__), os.pardir)))
 
+# Parse the version instead of executing the module
+with open("src/wetransfer/version.py", "r") as f:
+    __version__ = re.search(
+        r"^__version__\s*=\s*[\"']([^\"']+)[\"']", f.read(), re.M
+    ).group(1)
+
 # Get proper long description for package
 with open("README.md", "r") as f:
     description = f.read()
@@ -33,9 +36,14 @@ setup(
     maintainer_email="andreas@wetransfer.com",
     test_suite="tests",
     install_requires=[
-        "requests>=2.7.0",
-        "six"
+        "requests>=2.16",
+        "urllib3>=1.21.1",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "http2": ["httpx[http2]"],
+    },
+    python_requires=">=3.5",
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -43,9 +51,8 @@ setup(
         "Operating System :: OS Independent",
         "License :: OSI Approved :: GNU General Public License v3 (GPLv3)",
         "Programming Language :: Python",
-        "Programming Language :: Python :: 2",
-        "Programming Language :: Python :: 2.7",
         "Programming Language :: Python :: 3",
+        "Programming Language :: Python :: 3 :: Only",
         "Programming Language :: Python :: 3.5",
         "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
@@ -0,0 +1,44 @@
+"""
+A Python SDK for the WeTransfer's Public API.
+
+The public classes are imported from their submodules on first access, so
+importing the package alone doesn't pay for the HTTP stack.
+"""
+import os
+import sys
+import importlib
+
+from .version import __version__
+
+__all__ = ["WTApiClient", "Transfer", "File", "Link"]
+
+_SUBMODULES = {
+    "WTApiClient": ".client",
+    "Transfer": ".transfer",
+    "File": ".items",
+    "Link": ".items",
+}
+
+
+def __getattr__(name):
+    """Import a public class from its submodule and cache it (PEP 562)."""
+    if name not in _SUBMODULES:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+
+    value = getattr(importlib.import_module(_SUBMODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# Module level __getattr__ is only honoured from python 3.7 on. Before that,
+# or when WT_EAGER_IMPORT=1 is set (e.g. on CI to catch broken deferred
+# imports), everything is imported upfront.
+if sys.version_info < (3, 7) or os.environ.get("WT_EAGER_IMPORT") == "1":
+    for _name in __all__:
+        __getattr__(_name)
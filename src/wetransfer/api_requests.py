@@ -1,12 +1,229 @@
 """
 Module to host implementation of the different WeTransfer API HTTP queries
 our SDK is making. Official docs https://developers.wetransfer.com/documentation
+
+requests is only imported on the first HTTP call, as it pulls in urllib3, ssl
+and http.client which would otherwise slow down importing the SDK.
 """
-import requests
+import json
+import time
+import logging
+import threading
+
+try:
+    import orjson
+except ImportError:  # Optional, to speed up encoding and decoding json
+    orjson = None
 
 from .version import __version__
 from .logger import LOGGER
 
+DEFAULT_SERVER = "dev.wetransfer.com"
+DEFAULT_USER_AGENT = "WT python SDK v{0}".format(__version__)
+# Transient failures retried by sessions, only for idempotent methods: POSTs
+# (e.g. CreateTransfer, AddItems) could be applied twice by the API.
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+RETRY_METHODS = frozenset(["GET", "PUT"])
+
+
+def build_base_url(server=None):
+    """Return the scheme and host prefix of every API url for a server."""
+    return "https://{0}".format(server or DEFAULT_SERVER)
+
+
+def build_headers(key, token=None, user_agent=None):
+    """Return needed headers for the HTTP requests towards WT API."""
+    headers = {
+        "User-Agent": user_agent or DEFAULT_USER_AGENT,
+        "Content-Type": "application/json",
+        "x-api-key": key,
+    }
+    if token:
+        headers["Authorization"] = "Bearer {0}".format(token)
+
+    return headers
+
+
+def _requests():
+    """Import and return the requests module (cached after the first call)."""
+    import requests
+    return requests
+
+
+def response_json(response):
+    """
+    Return the decoded json body of a response. Uses orjson when installed,
+    which is several times faster than the standard library decoder on the
+    responses we get for every uploaded part.
+    """
+    if orjson is None:
+        return response.json()
+
+    return orjson.loads(response.content)
+
+
+def request_json(data):
+    """
+    Return data encoded as a json request body, with orjson when installed.
+    """
+    if orjson is None:
+        return json.dumps(data).encode("utf-8")
+
+    return orjson.dumps(data)
+
+
+def create_retry(total=5, backoff_factor=0.5):
+    """
+    Create the urllib3 Retry policy of sessions: GET and PUT calls failing
+    with a connection error or a RETRY_STATUSES response are retried with
+    exponential backoff, so a transient error on a single part doesn't fail
+    the whole upload. Every retry is logged as a warning.
+    """
+    from urllib3.util.retry import Retry
+
+    class LoggingRetry(Retry):
+
+        def increment(self, method=None, url=None, *args, **kwargs):
+            retry = super(LoggingRetry, self).increment(
+                method, url, *args, **kwargs
+            )
+            LOGGER.warning(
+                "Retrying %s request to <%s>, %s retries left",
+                method, url, retry.total
+            )
+            return retry
+
+    # urllib3 < 1.26 names allowed_methods method_whitelist
+    if hasattr(Retry, "DEFAULT_ALLOWED_METHODS"):
+        methods = {"allowed_methods": RETRY_METHODS}
+    else:
+        methods = {"method_whitelist": RETRY_METHODS}
+
+    # Once retries are exhausted, the last response is returned as is
+    return LoggingRetry(
+        total=total, backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES, respect_retry_after_header=True,
+        raise_on_status=False, **methods
+    )
+
+
+def create_session(pool_connections=8, pool_maxsize=16):
+    """
+    Create a requests Session to be shared by all HTTP queries of a client, so
+    keep-alive connections towards both the API and the upload hosts are
+    pooled and reused across calls and file parts. Failed idempotent calls
+    are retried, see create_retry.
+    """
+    from requests.adapters import HTTPAdapter
+
+    session = _requests().Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+        max_retries=create_retry()
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_DEFAULT_SESSION = None
+_DEFAULT_SESSION_LOCK = threading.Lock()
+
+
+def default_session():
+    """
+    Return the session used by calls made without one, e.g. by transfers and
+    items used without a client, created on first use. Being shared, it
+    pools connections across those calls instead of opening a new one for
+    every call as requests module level helpers do.
+    """
+    global _DEFAULT_SESSION
+    if _DEFAULT_SESSION is None:
+        with _DEFAULT_SESSION_LOCK:
+            if _DEFAULT_SESSION is None:
+                _DEFAULT_SESSION = create_session()
+
+    return _DEFAULT_SESSION
+
+
+class HTTP2Session(object):
+    """
+    Session sending API calls with httpx over HTTP/2, so concurrent calls
+    (e.g. GetUploadURL for parts uploaded in parallel) are multiplexed on one
+    connection instead of each waiting for a free HTTP/1.1 connection.
+    Part uploads stay on a pooled requests Session, their large bodies gain
+    nothing from multiplexing. GETs are retried as sessions retry them, see
+    create_retry, and POSTs are not. Needs the `wetransfer[http2]` extra.
+    """
+
+    def __init__(self, max_connections=16, total=5, backoff_factor=0.5):
+        import httpx
+
+        self.client = httpx.Client(
+            http2=True, limits=httpx.Limits(max_connections=max_connections)
+        )
+        self.upload_session = create_session()
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self._transport_error = httpx.TransportError
+
+    def get(self, url, **kwargs):
+        """
+        GET url, retrying connection errors and RETRY_STATUSES responses up
+        to total times with exponential backoff, or after the delay of their
+        Retry-After header. Once retries are exhausted, the last response is
+        returned as is.
+        """
+        for retries_left in range(self.total - 1, -2, -1):
+            try:
+                response = self.client.get(url, **kwargs)
+            except self._transport_error:
+                if retries_left < 0:
+                    raise
+                delay = None
+            else:
+                if (response.status_code not in RETRY_STATUSES or
+                        retries_left < 0):
+                    return self._compat(response)
+                delay = response.headers.get("Retry-After")
+                response.close()
+
+            LOGGER.warning(
+                "Retrying %s request to <%s>, %s retries left",
+                "GET", url, retries_left
+            )
+            time.sleep(self._backoff(self.total - retries_left - 1, delay))
+
+    def _backoff(self, retry, retry_after=None):
+        """
+        Seconds to wait before the given retry (counted from 0): the
+        Retry-After delay when given in seconds, else backoff_factor doubled
+        for every retry, capped at 120 seconds as urllib3 does
+        """
+        if retry_after is not None and retry_after.isdigit():
+            return int(retry_after)
+
+        return min(self.backoff_factor * (2 ** retry), 120)
+
+    def post(self, url, **kwargs):
+        # httpx expects raw bodies as content
+        if "data" in kwargs:
+            kwargs["content"] = kwargs.pop("data")
+        return self._compat(self.client.post(url, **kwargs))
+
+    def put(self, url, **kwargs):
+        return self.upload_session.put(url, **kwargs)
+
+    def close(self):
+        self.client.close()
+        self.upload_session.close()
+
+    @staticmethod
+    def _compat(response):
+        """Set the requests attributes we rely on on an httpx response"""
+        response.ok = response.is_success
+        response.request.body = response.request.content
+        return response
+
 
 class HTTPLogger(object):
     """
@@ -16,24 +233,29 @@ class HTTPLogger(object):
     """
     def log_request_details(self, request):
         """Verbose log requests"""
+        if not LOGGER.isEnabledFor(logging.DEBUG):
+            return
+
         request_body = request.body
         if request.method == "PUT":
             request_body = ""
 
-        log = (
-            "{0} request to <{1}> with headers:<{2}> and body:<{3}>"
-        ).format(request.method, request.url, request.headers, request_body)
-        LOGGER.debug(log)
+        LOGGER.debug(
+            "%s request to <%s> with headers:<%s> and body:<%s>",
+            request.method, request.url, request.headers, request_body
+        )
 
     def log_response_details(self, response):
         """Verbose log responses"""
-        log = (
-            " {0} <{1}> response from <{2}> with headers:<{3}> and body:<{4}>"
-        ).format(
+        # response.text decodes the whole body, skip it unless it's logged
+        if not LOGGER.isEnabledFor(logging.DEBUG):
+            return
+
+        LOGGER.debug(
+            " %s <%s> response from <%s> with headers:<%s> and body:<%s>",
             response.request.method, response.status_code,
             response.url, response.headers, response.text
         )
-        LOGGER.debug(log)
 
 
 class WTHTTP(HTTPLogger):
@@ -46,11 +268,16 @@ class WTHTTP(HTTPLogger):
         self.url = ""
         self.key = kwargs.get("key")
         self.token = kwargs.get("token")
-        self.server = kwargs.get("server") or "dev.wetransfer.com"
+        self.server = kwargs.get("server") or DEFAULT_SERVER
         self.headers = kwargs.get("headers")
+        # Without a client session we fall back to the module default one.
+        self.session = kwargs.get("session")
+        # Headers and url prefix a client has already built once, so they are
+        # not rebuilt for every single call (e.g. per uploaded part).
+        self.headers_prebuilt = kwargs.get("headers_prebuilt")
+        self.base_url = kwargs.get("base_url") or build_base_url(self.server)
 
-        default_user_agent = "WT python SDK v{0}".format(__version__)
-        self.http_agent = kwargs.get("user_agent") or default_user_agent
+        self.http_agent = kwargs.get("user_agent") or DEFAULT_USER_AGENT
 
         self.http_method_args = {
             "headers": self.get_headers(),
@@ -59,27 +286,25 @@ class WTHTTP(HTTPLogger):
         self.build_url()
 
     def get_headers(self):
-        """Return needed headers for the HTTP request."""
-        headers = {
-            "User-Agent": self.http_agent,
-            "Content-Type": "application/json",
-            "x-api-key": self.key,
-        }
-        if self.token:
-            headers["Authorization"] = "Bearer {0}".format(self.token)
+        """
+        Return needed headers for the HTTP request. Prebuilt headers are
+        returned as is and only copied when custom headers override them.
+        """
+        headers = self.headers_prebuilt
+        if headers is None:
+            headers = build_headers(self.key, self.token, self.http_agent)
 
         if self.headers:
-            headers.update(self.headers)
+            headers = dict(headers, **self.headers)
 
         return headers
 
     def build_url(self):
         """
-        Builds the request's url combining server and url_path
+        Builds the request's url combining base_url and url_path
         classes attributes.
         """
-        url_path = getattr(self, "url_path", "")
-        self.url = "https://{0}{1}".format(self.server, url_path)
+        self.url = self.base_url + getattr(self, "url_path", "")
 
 
 class WTGet(WTHTTP):
@@ -91,7 +316,8 @@ class WTGet(WTHTTP):
         """
         Makes the HTTP GET based on url attr and arguments.
         """
-        response = requests.get(self.url, **self.http_method_args)
+        session = self.session or default_session()
+        response = session.get(self.url, **self.http_method_args)
 
         self.log_request_details(response.request)
         self.log_response_details(response)
@@ -114,10 +340,12 @@ class WTPost(WTHTTP):
         """
         self._construct_post_data()
 
-        post_args = {"json": self.post_data}
+        # Encoded once here, the Content-Type header is already json
+        post_args = {"data": request_json(self.post_data)}
         self.http_method_args.update(post_args)
 
-        response = requests.post(self.url, **self.http_method_args)
+        session = self.session or default_session()
+        response = session.post(self.url, **self.http_method_args)
 
         self.log_request_details(response.request)
         self.log_response_details(response)
@@ -193,8 +421,24 @@ class GetUploadURL(WTGet):
         })
         super(GetUploadURL, self).__init__(**kwargs["client_options"])
 
+    @classmethod
+    def url_affixes(cls, base_url, file_id, multipart_upload_id):
+        """
+        Returns the parts of the url preceding and following the part number
+        for the given file upload.
+        """
+        prefix, suffix = cls.URL_PATH.split("{part_number}")
+        return (
+            base_url + prefix.format(file_id=file_id),
+            suffix.format(multipart_upload_id=multipart_upload_id)
+        )
+
     def create(self):
-        return self.get()
+        # Same call File.upload_part makes for every part, with a url built
+        # once per file from url_affixes
+        return get_upload_url(
+            self.url, self.http_method_args["headers"], self.session
+        )
 
 
 class FinishUpload(WTPost):
@@ -216,12 +460,31 @@ class FinishUpload(WTPost):
 class UploadPart(HTTPLogger):
     """Class to implement upload part PUT API call"""
 
-    def __init__(self, url, data):
+    def __init__(self, url, data, session=None):
         self.url = url
         self.data = data
+        self.session = session
 
     def create(self):
-        response = requests.put(self.url, data=self.data)
-        self.log_request_details(response.request)
-        self.log_response_details(response)
-        return response
+        return put_part(self.url, self.data, session=self.session)
+
+
+# Functions implementing the two HTTP calls made for every uploaded part,
+# without building a request object (with its own headers and url) per part.
+_HTTP_LOGGER = HTTPLogger()
+
+
+def get_upload_url(url, headers, session=None):
+    """Makes the get upload URL for a part API call to the given url."""
+    response = (session or default_session()).get(url, headers=headers)
+    _HTTP_LOGGER.log_request_details(response.request)
+    _HTTP_LOGGER.log_response_details(response)
+    return response
+
+
+def put_part(url, data, session=None):
+    """Makes the upload part PUT call of data to the given upload url."""
+    response = (session or default_session()).put(url, data=data)
+    _HTTP_LOGGER.log_request_details(response.request)
+    _HTTP_LOGGER.log_response_details(response)
+    return response
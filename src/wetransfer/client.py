@@ -1,6 +1,10 @@
 from .logger import LOGGER
 from .transfer import Transfer
-from .api_requests import Authorize
+from .token_cache import TokenCache
+from .api_requests import (
+    Authorize, HTTP2Session, build_base_url, build_headers, create_session,
+    response_json
+)
 
 
 class WTApiClient(object):
@@ -8,22 +12,49 @@ class WTApiClient(object):
     Class implementing logic for the client that connects to WT infrastructure
     It's the main entrypoint for the users, taking care auth and creating bare
     transfer objects.
+
+    Pass token_cache=True (or a TokenCache instance) to reuse authorization
+    tokens across processes instead of authorizing every time.
+
+    Pass use_http2=True to make API calls over HTTP/2 (needs httpx, see
+    HTTP2Session).
     """
 
     def __init__(self, **kwargs):
         self.key = kwargs["key"]
         self.server = kwargs.get("server")
         self.token = None
+        self.token_cache = kwargs.get("token_cache")
+        if self.token_cache is True:
+            self.token_cache = TokenCache()
+        if kwargs.get("use_http2"):
+            self.session = HTTP2Session()
+        else:
+            self.session = create_session()
+        self.base_url = build_base_url(self.server)
+        self.headers_prebuilt = build_headers(self.key)
 
-    def authorize(self):
+    def authorize(self, use_cache=True):
         """
         Implements authorization with WT API and stores the token returned
         upon success, which we will use for every other HTTP request towards
-        WT infra.
+        WT infra. With use_cache=False a cached token is ignored and a new one
+        is requested, replacing it in the cache (e.g. once the server has
+        revoked the cached one).
         """
+        if use_cache and self.token_cache is not None:
+            token = self.token_cache.get(self.key, self.base_url)
+            if token:
+                LOGGER.info("Using cached authorization token")
+                self._set_token(token)
+                return True
+
         client_options = {
             "key": self.key,
-            "server": self.server
+            "server": self.server,
+            "session": self.session,
+            "base_url": self.base_url,
+            "headers_prebuilt": self.headers_prebuilt
         }
         res = Authorize(**client_options).create()
         if not res.ok:
@@ -34,15 +65,22 @@ class WTApiClient(object):
         log = "Successfully authorized"
         LOGGER.info(log)
 
-        body = res.json()
+        body = response_json(res)
         if "token" not in body:
             LOGGER.error("Expected 'token' in Authorize json response")
             return False
 
-        self.token = str(body["token"])
+        self._set_token(str(body["token"]))
+        if self.token_cache is not None:
+            self.token_cache.set(self.key, self.base_url, self.token)
 
         return True
 
+    def _set_token(self, token):
+        """Stores the token and rebuilds the headers that carry it"""
+        self.token = token
+        self.headers_prebuilt = build_headers(self.key, self.token)
+
     def create_transfer(self, transfer_name="WT Transfer"):
         """
         Creates an bare transfer that we will use later to add our items
@@ -53,10 +91,26 @@ class WTApiClient(object):
             "key": self.key,
             "name": transfer_name,
             "token": self.token,
-            "server": self.server
+            "server": self.server,
+            "session": self.session,
+            "base_url": self.base_url,
+            "headers_prebuilt": self.headers_prebuilt
         }
         transfer = Transfer(**client_options)
         if not transfer.create():
             return None
 
         return transfer
+
+    def close(self):
+        """
+        Closes the HTTP session shared by all the calls of this client and
+        releases its pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -1,17 +1,64 @@
 """Module to hold different types of transfer items"""
 import os
-import six
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from .logger import LOGGER
-from .api_requests import GetUploadURL, UploadPart, FinishUpload
+from .api_requests import (
+    GetUploadURL, FinishUpload, build_base_url, build_headers, get_upload_url,
+    put_part, response_json
+)
+
+DEFAULT_CHUNK_SIZE = 6291456  # 6MB
+DEFAULT_MAX_WORKERS = 4  # parts uploaded concurrently
+# Not available on Windows and before Python 3.8
+_MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+
+# Log templates of the per part and per file upload steps, formatted by
+# logging only when a handler emits the record
+_FETCH_URL_FAILED = (
+    "Failed fetching url for item id: %s, upload_id: %s, part_number: %s"
+)
+_FETCH_URL_OK = (
+    "Successfully fetched url for item id: %s, upload_id: %s, part_number: %s"
+)
+_PUT_PART_FAILED = "Failed PUT-ing part-number %s for item id: %s"
+_PUT_PART_OK = "Successfully PUT-ed part-number %s for item id: %s"
+_FINISH_FAILED = "Failed closing upload for item id: %s"
+_FINISH_OK = "Successfully closed upload for item id: %s"
+_PARTS_MISMATCH = (
+    "Item id: %s is cut in %s parts of %s bytes but the API expects %s parts"
+)
 
 
 class File(object):
     """
     Class to hold actions and attributes related to a File type transfer item
+
+    The file is uploaded in parts of chunk_size bytes. Larger chunks mean
+    fewer API calls and uploads for big files, but more data to send again
+    when a part fails. The API allocates the parts of the multipart upload
+    for DEFAULT_CHUNK_SIZE chunks, so a file cut in another number of parts
+    is not uploaded.
+    Up to max_workers parts, and so up to max_workers chunks of memory, are
+    uploaded at the same time.
     """
-    def __init__(self, filepath):
-        self.CHUNK_SIZE = 6291456  # 6MB
+    def __init__(self, filepath, chunk_size=DEFAULT_CHUNK_SIZE,
+                 max_workers=DEFAULT_MAX_WORKERS):
+        # Checked here as the upload only starts after AddItems registered
+        # the file with the API
+        if chunk_size <= 0:
+            raise ValueError(
+                "chunk_size must be positive, got {0}".format(chunk_size)
+            )
+        if max_workers <= 0:
+            raise ValueError(
+                "max_workers must be positive, got {0}".format(max_workers)
+            )
+
+        self.CHUNK_SIZE = chunk_size
+        self.MAX_WORKERS = max_workers
         self.filename = None
         self.filesize = None
         self.content_identifier = "file"
@@ -21,6 +68,10 @@ class File(object):
         self.multipart_parts = None
         self.multipart_upload_id = None
         self.client_options = None
+        self._serialized = None
+        self._str = None
+        self._part_url_affixes = None
+        self._part_headers = None
 
         self._init_file()
 
@@ -28,17 +79,22 @@ class File(object):
         """Further initialize the File instance with additional details"""
 
         _, self.filename = os.path.split(self.local_identifier)
-        self.filesize = os.path.getsize(self.local_identifier)
+        self.filesize = os.stat(self.local_identifier).st_size
 
     def serialize(self):
-        """Serialize object to needed format from the API"""
+        """
+        Serialize object to needed format from the API. The output is built
+        once and returned again for every following AddItems request.
+        """
+        if self._serialized is None:
+            self._serialized = {
+                "filename": self.filename,
+                "filesize": self.filesize,
+                "content_identifier": self.content_identifier,
+                "local_identifier": self.local_identifier[-34:]
+            }
 
-        return {
-            "filename": self.filename,
-            "filesize": self.filesize,
-            "content_identifier": self.content_identifier,
-            "local_identifier": self.local_identifier[-34:]
-        }
+        return self._serialized
 
     def load_info(self, **kwargs):
         """
@@ -48,85 +104,185 @@ class File(object):
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+        # Loaded details are part of the string representation and part urls
+        self._serialized = None
+        self._str = None
+        self._part_url_affixes = None
+        self._part_headers = None
+
     def upload(self):
         """
         Implements logic for uploading item after spliting it into 6M chunks
-        and uploading each of them separetly.
+        and uploading up to MAX_WORKERS of them concurrently. Nothing is
+        uploaded when the file is not cut in as many parts as the API
+        allocated for it in the add items response.
         """
+        parts = -(-self.filesize // self.CHUNK_SIZE)
+        if parts != self.multipart_parts:
+            LOGGER.error(
+                _PARTS_MISMATCH, self.id, parts, self.CHUNK_SIZE,
+                self.multipart_parts
+            )
+            return False
 
-        with open(self.local_identifier) as f:
-            i = 1
-            # Split file into pieces and read sequentially
-            for piece in iter(lambda: f.read(self.CHUNK_SIZE), ''):
-                res = self.upload_part(piece, i)
-                if not res:
-                    return False
-                i += 1
+        if not self._upload_parts():
+            return False
 
         kwargs = {"id": self.id, "client_options": self.client_options}
         res = FinishUpload(**kwargs).create()
         if not res.ok:
-            log = "Failed closing upload for item id: {0}".format(self.id)
-            LOGGER.error(log)
+            LOGGER.error(_FINISH_FAILED, self.id)
             return False
 
-        log = "Successfully closed upload for item id: {0}".format(self.id)
-        LOGGER.info(log)
+        LOGGER.info(_FINISH_OK, self.id)
         return True
 
+    def _upload_parts(self):
+        """
+        Reads the file sequentially and hands each chunk to a pool of workers,
+        so fetching the URL of a part overlaps with the upload of the previous
+        ones. At most MAX_WORKERS chunks are in flight (and in memory) at any
+        time and no new part is submitted once one of them has failed.
+
+        Chunks are zero-copy memoryview slices of a read-only memory map of
+        the file, so no chunk is ever copied into a Python bytes object
+        before being sent. The kernel is told the map is read sequentially,
+        so it reads ahead in large batches instead of faulting pages in one
+        by one. Once every part is done, the slices are released and the map
+        closed, rather than left to the garbage collector (which keeps the
+        file locked on Windows).
+        """
+        if not self.filesize:
+            return True
+
+        with open(self.local_identifier, "rb") as f:
+            # The map outlives the file descriptor, until it is closed
+            data = mmap.mmap(f.fileno(), self.filesize, access=mmap.ACCESS_READ)
+
+        pieces = []
+        try:
+            if _MADV_SEQUENTIAL is not None:
+                data.madvise(_MADV_SEQUENTIAL)
+
+            with memoryview(data) as view:
+                try:
+                    return self._submit_parts(self._read_parts(view), pieces)
+                finally:
+                    for piece in pieces:
+                        piece.release()
+        finally:
+            data.close()
+
+    def _submit_parts(self, parts, pieces):
+        """
+        Uploads the (part number, data) pairs of parts on a pool of workers,
+        adding each data to pieces, and returns once all uploads are done.
+        """
+        slots = threading.BoundedSemaphore(self.MAX_WORKERS)
+        failed = threading.Event()
+
+        def part_done(future):
+            slots.release()
+            if future.cancelled() or future.exception() or not future.result():
+                failed.set()
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for part_number, piece in parts:
+                pieces.append(piece)
+                slots.acquire()
+                if failed.is_set():
+                    break
+                future = executor.submit(self.upload_part, piece, part_number)
+                future.add_done_callback(part_done)
+                futures.append(future)
+
+            if failed.is_set():
+                for future in futures:
+                    future.cancel()
+
+        # Re-raises the exception of a failed part, if any
+        return all(f.result() for f in futures if not f.cancelled())
+
+    def _read_parts(self, view):
+        """
+        Yields the part number and data of each chunk of CHUNK_SIZE bytes of
+        view, as slices of it
+        """
+        offsets = range(0, len(view), self.CHUNK_SIZE)
+        for part_number, offset in enumerate(offsets, 1):
+            yield part_number, view[offset:offset + self.CHUNK_SIZE]
+
+    def _part_url(self, part_number):
+        """
+        Returns the API url to fetch the upload URL of a part from. Only the
+        part number changes between parts, the rest is built once per file.
+        """
+        if self._part_url_affixes is None:
+            base_url = self.client_options.get("base_url") or build_base_url(
+                self.client_options.get("server")
+            )
+            self._part_url_affixes = GetUploadURL.url_affixes(
+                base_url, self.id, self.multipart_upload_id
+            )
+
+        prefix, suffix = self._part_url_affixes
+        return prefix + str(part_number) + suffix
+
+    def _get_part_headers(self):
+        """Returns the API headers for the parts, built once per file."""
+        if self._part_headers is None:
+            self._part_headers = (
+                self.client_options.get("headers_prebuilt") or build_headers(
+                    self.client_options.get("key"),
+                    self.client_options.get("token")
+                )
+            )
+
+        return self._part_headers
+
     def upload_part(self, part, part_number):
         """
         Uploads specific part after fetching URL from the API for this part
         """
-        kwargs = {
-            "id": self.id, "part_number": part_number,
-            "multipart_upload_id": self.multipart_upload_id,
-            "client_options": self.client_options
-        }
-        res = GetUploadURL(**kwargs).create()
+        session = self.client_options.get("session")
+        res = get_upload_url(
+            self._part_url(part_number), self._get_part_headers(), session
+        )
         if not res.ok:
-            log = (
-                "Failed fetching url for item id: {0}, upload_id: {1}, "
-                "part_number: {2}"
-            ).format(
-                self.id, self.multipart_upload_id, part_number
+            LOGGER.error(
+                _FETCH_URL_FAILED, self.id, self.multipart_upload_id,
+                part_number
             )
-            LOGGER.error(log)
             return False
 
-        log = (
-            "Successfully fetched url for item id: {0}, upload_id: {1}, "
-            "part_number: {2}"
-        ).format(self.id, self.multipart_upload_id, part_number)
-        LOGGER.info(log)
+        LOGGER.info(
+            _FETCH_URL_OK, self.id, self.multipart_upload_id, part_number
+        )
 
-        body = res.json()
+        body = response_json(res)
         upload_url = body["upload_url"]
 
-        res = UploadPart(upload_url, part).create()
+        res = put_part(upload_url, part, session)
 
         if not res.ok:
-            log = "Failed PUT-ing part-number {0} for item id: {1}".format(
-                part_number, self.id)
-            LOGGER.error(log)
+            LOGGER.error(_PUT_PART_FAILED, part_number, self.id)
             return False
 
-        log = (
-            "Successfully PUT-ed part-number {0} for item id: {1}"
-        ).format(part_number, self.id)
-        LOGGER.info(log)
+        LOGGER.info(_PUT_PART_OK, part_number, self.id)
 
         return True
 
     def __str__(self):
-        log = (
-            "Transfer item, file type, with size {0}, name {1}, and local path"
-            " {2}, has {3} multi parts"
-        ).format(
-            self.filesize, self.filename,
-            self.local_identifier, self.multipart_parts
-        )
-        return log
+        if self._str is None:
+            self._str = (
+                "Transfer item, file type, with size {0}, name {1}, and local "
+                "path {2}, has {3} multi parts"
+            ).format(
+                self.filesize, self.filename,
+                self.local_identifier, self.multipart_parts
+            )
+        return self._str
 
 
 class Link(object):
@@ -138,21 +294,26 @@ class Link(object):
         self.local_identifier = self._get_hex_repr(url)
         self.url = url
         self.title = title
+        self._serialized = None
 
     def _get_hex_repr(self, url):
-        if six.PY2:
-            return url.encode("hex")[-34:]
-        else:
-            return url.encode("utf-8").hex()[-34:]
+        # Only the last 17 bytes end up in the 34 hex digits kept
+        return url.encode("utf-8")[-17:].hex()
 
     def serialize(self):
-        """Serialize object to needed format from the API"""
-        return {
-            "content_identifier": self.content_identifier,
-            "local_identifier": self.local_identifier,
-            "meta": {"title": self.title},
-            "url": self.url
-        }
+        """
+        Serialize object to needed format from the API. The output is built
+        once and returned again for every following AddItems request.
+        """
+        if self._serialized is None:
+            self._serialized = {
+                "content_identifier": self.content_identifier,
+                "local_identifier": self.local_identifier,
+                "meta": {"title": self.title},
+                "url": self.url
+            }
+
+        return self._serialized
 
     def __str__(self):
         log = (
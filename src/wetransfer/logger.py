@@ -1,5 +1,75 @@
 """Module to create a specific logger for the whole package"""
 import logging
+import threading
+import contextlib
+from logging.handlers import MemoryHandler
 
 LOGGER = logging.getLogger("wetransfer-python-sdk")
 LOGGER.addHandler(logging.NullHandler())
+
+
+class _ReplayHandler(logging.Handler):
+    """
+    Handler passing records on to the given handlers, and to the handlers of
+    the parent loggers when propagating, as LOGGER itself would have.
+    """
+
+    def __init__(self, handlers, propagate):
+        logging.Handler.__init__(self)
+        self.handlers = handlers
+        self.propagate = propagate
+
+    def emit(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+        if self.propagate and LOGGER.parent is not None:
+            LOGGER.parent.callHandlers(record)
+
+
+# Buffering shared by all the buffered_logging blocks active at a time, as
+# (memory handler, saved handlers, saved propagate), and how many they are
+_BUFFER = None
+_BUFFER_DEPTH = 0
+_BUFFER_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def buffered_logging(capacity=128, flush_level=logging.ERROR):
+    """
+    Context manager holding the records logged by the SDK in memory and
+    handing them to the configured handlers in batches of capacity records,
+    on a record of flush_level or above, and when the block exits. Uploads of
+    files with many parts log a few records per part, which otherwise means
+    a write per record for file or stream handlers.
+
+    Buffering is process wide and safe to use from several threads: blocks
+    entered while another one is active, nested or on other threads, share
+    its buffer (and its capacity and flush_level), and LOGGER is restored
+    once the last active block exits, whatever order they exit in. Records
+    logged by any thread in the meantime are buffered too. Handlers added to
+    LOGGER while buffering are dropped when it ends.
+    """
+    global _BUFFER, _BUFFER_DEPTH
+    with _BUFFER_LOCK:
+        if _BUFFER_DEPTH == 0:
+            handlers, propagate = LOGGER.handlers, LOGGER.propagate
+            memory = MemoryHandler(
+                capacity, flushLevel=flush_level,
+                target=_ReplayHandler(handlers, propagate)
+            )
+            LOGGER.handlers, LOGGER.propagate = [memory], False
+            _BUFFER = (memory, handlers, propagate)
+        _BUFFER_DEPTH += 1
+
+    try:
+        yield
+    finally:
+        with _BUFFER_LOCK:
+            _BUFFER_DEPTH -= 1
+            if _BUFFER_DEPTH == 0:
+                memory, handlers, propagate = _BUFFER
+                LOGGER.handlers, LOGGER.propagate = handlers, propagate
+                _BUFFER = None
+                memory.close()
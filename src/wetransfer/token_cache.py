@@ -0,0 +1,130 @@
+"""Module to implement an on-disk cache for authorization tokens"""
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+from .logger import LOGGER
+
+
+class TokenCache(object):
+    """
+    Class to persist authorization tokens on disk, keyed by API key and
+    server, so short lived processes can skip the Authorize round trip while
+    a token they got earlier is still valid.
+    """
+
+    DEFAULT_TTL = 3600  # seconds
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        self.path = path or self.default_path()
+        self.ttl = ttl
+
+    @staticmethod
+    def default_path():
+        """Return the cache file path, honouring $XDG_CACHE_HOME"""
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        return os.path.join(cache_home, "wetransfer", "tokens.json")
+
+    @staticmethod
+    def cache_key(key, server):
+        """
+        Return the entry key for an API key and server. Keys are hashed so
+        the API key itself is never written to disk.
+        """
+        raw = "{0}\n{1}".format(key, server).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key, server):
+        """Return the cached token for the API key and server, if still valid"""
+        entry = self._load().get(self.cache_key(key, server))
+        if not entry or entry["expires"] <= time.time():
+            return None
+
+        return entry["token"]
+
+    def set(self, key, server, token):
+        """
+        Store a token for the API key and server, dropping expired entries.
+        Failing to write the cache is logged but never raised.
+        """
+        now = time.time()
+        entries = dict(
+            (k, v) for k, v in self._load().items() if v["expires"] > now
+        )
+        entries[self.cache_key(key, server)] = {
+            "token": token, "expires": now + self.ttl
+        }
+
+        self._write(entries)
+
+    def delete(self, key, server):
+        """
+        Drop the cached token for the API key and server, e.g. once the
+        server rejected it. Failing to write the cache is logged but never
+        raised.
+        """
+        entries = self._load()
+        if entries.pop(self.cache_key(key, server), None) is not None:
+            self._write(entries)
+
+    def _write(self, entries):
+        """Write cache entries, logging instead of raising on failure"""
+        try:
+            self._dump(entries)
+        except OSError as e:
+            LOGGER.warning("Failed writing token cache %s: %s", self.path, e)
+
+    def _load(self):
+        """
+        Read cache entries, treating a missing or corrupt file as empty and
+        dropping any entry that is not a token with its expiry time.
+        """
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(entries, dict):
+            return {}
+
+        return dict(
+            (k, v) for k, v in entries.items() if self._valid_entry(v)
+        )
+
+    @staticmethod
+    def _valid_entry(entry):
+        """Whether a cache entry holds a str token and a numeric expiry"""
+        if not isinstance(entry, dict):
+            return False
+
+        expires = entry.get("expires")
+        return (
+            isinstance(entry.get("token"), str) and
+            isinstance(expires, (int, float)) and
+            not isinstance(expires, bool)
+        )
+
+    def _dump(self, entries):
+        """
+        Write cache entries atomically: they are written to an exclusively
+        created temporary file (readable by the owner only) which is then
+        renamed over the cache, so concurrent writers never interleave.
+        """
+        # A bare file name lives in the current directory
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
@@ -1,7 +1,9 @@
 """Module that implements logic related to transfers"""
+import logging
+
 from .logger import LOGGER
-from .items import File, Link
-from .api_requests import AddItems, CreateTransfer, FinishUpload
+from .items import DEFAULT_CHUNK_SIZE, DEFAULT_MAX_WORKERS, File, Link
+from .api_requests import AddItems, CreateTransfer, response_json
 
 
 class Transfer(object):
@@ -13,12 +15,17 @@ class Transfer(object):
         self.transfer_id = None
         self.transfer_items = []
         self.transfer_files = []
+        # transfer_items before this index have been added to the transfer
+        self._items_added = 0
         self.name = kwargs["name"]
         self.client_options = {
             "name": self.name,
             "key": kwargs["key"],
             "token": kwargs["token"],
             "server": kwargs.get("server"),
+            "session": kwargs.get("session"),
+            "base_url": kwargs.get("base_url"),
+            "headers_prebuilt": kwargs.get("headers_prebuilt"),
         }
 
     def create(self):
@@ -35,7 +42,7 @@ class Transfer(object):
         log = "Successfully created new transfer"
         LOGGER.info(log)
 
-        body = res.json()
+        body = response_json(res)
         self.transfer_id = body["id"]
         self.shortened_url = body["shortened_url"]
 
@@ -44,84 +51,114 @@ class Transfer(object):
     def add_items(self, items):
         """
         Implement logic for adding items in the given list, upload them, and
-        closing the transfer itself.
+        closing the transfer itself. Items added by an earlier call are
+        neither sent nor uploaded again, while the ones a failed call could
+        not add are sent along with the new ones.
         """
         self.transfer_items.extend(items)
-        kwargs = {
-            "items": self.transfer_items, "transfer_id": self.transfer_id
-        }
+        pending = self.transfer_items[self._items_added:]
+        kwargs = {"items": pending, "transfer_id": self.transfer_id}
         kwargs.update(self.client_options)
 
         res = AddItems(**kwargs).create()
 
-        if not self.validate_add_items_response(res):
+        returned_items = self._validate_add_items_response(res, pending)
+        if returned_items is None:
             return False
 
-        log = "Successfully added items: {0} to transfer {1}".format(
-                [str(i) for i in self.transfer_items], self.transfer_id
-        )
-        LOGGER.info(log)
-
-        returned_items = res.json()
+        self._items_added = len(self.transfer_items)
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info(
+                "Successfully added items: %s to transfer %s",
+                [str(i) for i in pending], self.transfer_id
+            )
 
-        for index, item in enumerate(returned_items):
-            if item["content_identifier"] == "web_content":
+        # Returned items come in the order they were sent, so each one is
+        # paired with the item it describes and only files need their info
+        files = []
+        for item, returned in zip(pending, returned_items):
+            if item.content_identifier != "file":
                 continue
 
-            kwargs = {
-                "id": item["id"], "transfer_id": self.transfer_id,
-                "client_options": self.client_options,
-                "multipart_parts": item["meta"]["multipart_parts"],
-                "multipart_upload_id": item["meta"]["multipart_upload_id"],
-            }
-            self.transfer_items[index].load_info(**kwargs)
-            self.transfer_files.append(self.transfer_items[index])
+            meta = returned["meta"]
+            item.load_info(
+                id=returned["id"], transfer_id=self.transfer_id,
+                client_options=self.client_options,
+                multipart_parts=meta["multipart_parts"],
+                multipart_upload_id=meta["multipart_upload_id"],
+            )
+            files.append(item)
+
+        self.transfer_files.extend(files)
 
-        return self.upload_items()
+        return self.upload_items(files)
 
     def validate_add_items_response(self, response):
+        """
+        Returns whether the response of the add items API call is valid for
+        the items not added yet
+        """
+        return self._validate_add_items_response(response) is not None
+
+    def _validate_add_items_response(self, response, items=None):
+        """
+        Validates the response of the add items API call for the items sent,
+        the ones not added yet by default, and returns the items it holds, so
+        its json body is parsed only once, or None if the response is not
+        valid.
+        """
+        if items is None:
+            items = self.transfer_items[self._items_added:]
+
         if not response.ok:
-            log = "Failed to add items: {0} to transfer {1}".format(
-                [str(i) for i in self.transfer_items], self.transfer_id
+            LOGGER.error(
+                "Failed to add items: %s to transfer %s",
+                [str(i) for i in items], self.transfer_id
             )
-            LOGGER.error(log)
-            return False
+            return None
 
-        returned_items = response.json()
+        returned_items = response_json(response)
 
-        if len(returned_items) != len(self.transfer_items):
-            log = (
-                "Add items API call didn't return same number of items ({0}) "
-                "than what we sent ({1})"
-            ).format(len(returned_items), len(self.transfer_items))
-            LOGGER.error(log)
-            return False
+        if len(returned_items) != len(items):
+            LOGGER.error(
+                "Add items API call didn't return same number of items (%s) "
+                "than what we sent (%s)",
+                len(returned_items), len(items)
+            )
+            return None
 
-        return True
+        return returned_items
 
-    def upload_items(self):
-        """Uploads each item of the instances items list"""
-        for item in self.transfer_files:
+    def upload_items(self, files=None):
+        """
+        Uploads each of the given files, all the files of the transfer by
+        default
+        """
+        if files is None:
+            files = self.transfer_files
+
+        for item in files:
             r = item.upload()
             if not r:
-                log = "Failed to upload item {0}".format(item)
-                LOGGER.error(log)
+                LOGGER.error("Failed to upload item %s", item)
                 return False
 
-            log = "Successfully uploaded item {0}".format(item)
-            LOGGER.info(log)
+            LOGGER.info("Successfully uploaded item %s", item)
 
         return True
 
-    def add_files(self, file_paths):
-        """Helper function to upload file only type items given the paths"""
+    def add_files(self, file_paths, chunk_size=DEFAULT_CHUNK_SIZE,
+                  max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Helper function to upload file only type items given the paths, in
+        parts of chunk_size bytes with up to max_workers of them at a time
+        """
         if isinstance(file_paths, str):
-            self.transfer_items.append(File(file_paths))
-        elif isinstance(file_paths, list):
-            for path in file_paths:
-                self.transfer_items.append(File(path))
+            file_paths = [file_paths]
 
-        return self.add_items()
+        return self.add_items(
+            [File(path, chunk_size, max_workers) for path in file_paths]
+        )
 
     def add_links(self, urls):
         """Helper function to upload link only type items given the URLs"""
@@ -1,28 +1,59 @@
 import os
+import sys
 import logging
+import subprocess
 import mock
 import requests
-from unittest import skip, main, TestCase
+from unittest import skip, skipIf, main, TestCase
+from wetransfer import api_requests
 from wetransfer.api_requests import (
     HTTPLogger, WTHTTP, WTGet, WTPost, Authorize, CreateTransfer, AddItems,
-    UploadPart, FinishUpload, GetUploadURL
+    UploadPart, FinishUpload, GetUploadURL, HTTP2Session, create_retry,
+    create_session, default_session, response_json, request_json,
+    get_upload_url, put_part
 )
 from wetransfer.logger import LOGGER
 from wetransfer.version import __version__
 from wetransfer.items import File, Link
 
+try:
+    import httpx
+    import h2
+except ImportError:
+    httpx = None
+
+
+def swap(test, obj, name, value):
+    """
+    Set an attribute of obj to value until the test ends. A plain setattr is
+    much cheaper than mock.patch resolving and wrapping its target.
+    """
+    test.addCleanup(setattr, obj, name, getattr(obj, name))
+    setattr(obj, name, value)
+
+
+_KWARGS = {
+    "key": "test_key",
+    "token": "test_token",
+    "server": "test_server",
+}
+_EXPECTED_AGENT = "WT python SDK v{0}".format(__version__)
+_EXPECTED_HEADERS = {
+    "User-Agent": _EXPECTED_AGENT,
+    "Content-Type": "application/json",
+    "x-api-key": _KWARGS["key"],
+    "Authorization": "Bearer {0}".format(_KWARGS["token"])
+}
+
+# Messages logged by HTTPLogger for requests and responses
+_REQ_TEMPLATE = "%s request to <%s> with headers:<%s> and body:<%s>"
+_RESP_TEMPLATE = " %s <%s> response from <%s> with headers:<%s> and body:<%s>"
+
 
 class MockLoggingHandler(logging.Handler):
     """Mock logging handler to check for expected logs."""
 
     def __init__(self, *args, **kwargs):
-        self.reset()
-        logging.Handler.__init__(self, *args, **kwargs)
-
-    def emit(self, record):
-        self.messages[record.levelname.lower()].append(record.getMessage())
-
-    def reset(self):
         self.messages = {
             'debug': [],
             'info': [],
@@ -30,6 +61,37 @@ class MockLoggingHandler(logging.Handler):
             'error': [],
             'critical': [],
         }
+        logging.Handler.__init__(self, *args, **kwargs)
+
+    def emit(self, record):
+        self.messages[record.levelname.lower()].append(record.getMessage())
+
+    def reset(self):
+        for messages in self.messages.values():
+            messages.clear()
+
+
+# A single handler is installed for the tests of this module and reset by
+# every test using it, rather than a new one being added for each test.
+_MOCK_HANDLER = MockLoggingHandler()
+
+
+def setUpModule():
+    logging.basicConfig()
+    logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
+    LOGGER.addHandler(_MOCK_HANDLER)
+
+
+def tearDownModule():
+    LOGGER.removeHandler(_MOCK_HANDLER)
+
+
+class MockLoggingMixin(object):
+    """Mixin giving tests the module MockLoggingHandler, reset per test."""
+
+    def setUp(self):
+        _MOCK_HANDLER.reset()
+        self.mock_handler = _MOCK_HANDLER
 
 
 class FakeRequest(object):
@@ -49,34 +111,68 @@ class FakeResponse(object):
         self.text = "test_text"
 
 
-class TestHTTPLogger(TestCase):
+# Fakes are never modified by the tests, so they are built once and shared;
+# a test needing to change one should work on a copy.copy of it.
+_FAKE_REQ_GET = FakeRequest("GET")
+_FAKE_REQ_PUT = FakeRequest("PUT")
+_FAKE_RESP_GET = FakeResponse("GET")
+_FAKE_RESP_POST = FakeResponse("POST")
+_FAKE_RESP_PUT = FakeResponse("PUT")
+
+
+class TestHTTPLogger(MockLoggingMixin, TestCase):
 
     def setUp(self):
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
-        self.mock_handler = MockLoggingHandler()
-        LOGGER.addHandler(self.mock_handler)
+        super(TestHTTPLogger, self).setUp()
         self.httpLogger = HTTPLogger()
 
+    def test_mock_handler_installed_once(self):
+        """Tests handlers of earlier test classes are not left on LOGGER"""
+        handlers = [
+            h for h in LOGGER.handlers if isinstance(h, MockLoggingHandler)
+        ]
+        self.assertEqual(handlers, [self.mock_handler])
+
     def test_log_request_details(self):
         """Tests the function that logs the request"""
-        request = FakeRequest()
-        expected_output = (
-            "{0} request to <{1}> with headers:<{2}> and "
-            "body:<{3}>"
-        ).format(request.method, request.url, request.headers, request.body)
+        request = _FAKE_REQ_GET
+        expected_output = _REQ_TEMPLATE % (
+            request.method, request.url, request.headers, request.body
+        )
         self.httpLogger.log_request_details(request)
         self.assertEqual(
             expected_output, self.mock_handler.messages["debug"][0]
         )
 
+    def test_log_request_details_lazy(self):
+        """Tests the request is logged with lazy %-style arguments"""
+        request = _FAKE_REQ_GET
+        with mock.patch.object(LOGGER, "debug", new=mock.Mock()) as mock_debug:
+            self.httpLogger.log_request_details(request)
+        mock_debug.assert_called_once_with(
+            _REQ_TEMPLATE,
+            request.method, request.url, request.headers, request.body
+        )
+
+    def test_log_request_details_disabled(self):
+        """Tests nothing is logged for requests when debug logs are off"""
+        request = mock.Mock()
+        type(request).body = mock.PropertyMock()
+        type(request).headers = mock.PropertyMock()
+        LOGGER.setLevel(logging.WARNING)
+        self.addCleanup(LOGGER.setLevel, logging.DEBUG)
+        with mock.patch.object(LOGGER, "debug", new=mock.Mock()) as mock_debug:
+            self.httpLogger.log_request_details(request)
+        mock_debug.assert_not_called()
+        self.assertEqual(type(request).body.call_count, 0)
+        self.assertEqual(type(request).headers.call_count, 0)
+
     def test_log_request_details_put(self):
         """Tests the function that logs the PUT request"""
-        request = FakeRequest(method="PUT")
-        expected_output = (
-            "{0} request to <{1}> with headers:<{2}> and "
-            "body:<>"
-        ).format(request.method, request.url, request.headers)
+        request = _FAKE_REQ_PUT
+        expected_output = _REQ_TEMPLATE % (
+            request.method, request.url, request.headers, ""
+        )
         self.httpLogger.log_request_details(request)
         self.assertEqual(
             expected_output, self.mock_handler.messages["debug"][0]
@@ -84,11 +180,8 @@ class TestHTTPLogger(TestCase):
 
     def test_log_response_details(self):
         """Tests the function that logs the response"""
-        response = FakeResponse()
-        expected_output = (
-            " {0} <{1}> response from <{2}> with headers:<{3}> and "
-            "body:<{4}>"
-        ).format(
+        response = _FAKE_RESP_GET
+        expected_output = _RESP_TEMPLATE % (
             response.request.method, response.status_code, response.url,
             response.headers, response.text
         )
@@ -97,21 +190,229 @@ class TestHTTPLogger(TestCase):
             expected_output, self.mock_handler.messages["debug"][0]
         )
 
+    def test_log_response_details_disabled(self):
+        """Tests nothing is logged for responses when debug logs are off"""
+        LOGGER.setLevel(logging.WARNING)
+        self.addCleanup(LOGGER.setLevel, logging.DEBUG)
+        with mock.patch.object(LOGGER, "debug", new=mock.Mock()) as mock_debug:
+            self.httpLogger.log_response_details(_FAKE_RESP_GET)
+        mock_debug.assert_not_called()
+
+    def test_log_response_details_skip_body(self):
+        """Tests the response body is not decoded when debug logs are off"""
+        response = mock.Mock()
+        type(response).text = mock.PropertyMock()
+        LOGGER.setLevel(logging.INFO)
+        self.addCleanup(LOGGER.setLevel, logging.DEBUG)
+        self.httpLogger.log_response_details(response)
+        self.assertEqual(type(response).text.call_count, 0)
+        self.assertEqual(self.mock_handler.messages["debug"], [])
+
+
+class TestLazyImport(TestCase):
+
+    def test_import_without_requests(self):
+        """Tests that importing the SDK modules doesn't import requests"""
+        code = (
+            "import sys, wetransfer.items, wetransfer.api_requests; "
+            "print('requests' in sys.modules)"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output([sys.executable, "-c", code], env=env)
+        self.assertEqual(output.strip(), b"False")
+
+
+class TestResponseJSON(TestCase):
+
+    def setUp(self):
+        self.response = mock.Mock()
+        self.response.content = b'{"upload_url": "test_url"}'
+        self.response.json.return_value = {"upload_url": "json_url"}
+
+    def test_response_json(self):
+        expected = {"upload_url": "test_url"}
+        with mock.patch.object(
+            api_requests, "orjson", new=mock.Mock()
+        ) as mock_orjson:
+            mock_orjson.loads.return_value = expected
+            self.assertEqual(response_json(self.response), expected)
+            mock_orjson.loads.assert_called_once_with(self.response.content)
+            self.assertEqual(self.response.json.call_count, 0)
+
+    def test_response_json_fallback(self):
+        with mock.patch.object(api_requests, "orjson", None):
+            self.assertEqual(
+                response_json(self.response), {"upload_url": "json_url"}
+            )
+
+
+class TestRequestJSON(TestCase):
+
+    def test_request_json(self):
+        with mock.patch.object(
+            api_requests, "orjson", new=mock.Mock()
+        ) as mock_orjson:
+            mock_orjson.dumps.return_value = b'{"name":"test"}'
+            self.assertEqual(
+                request_json({"name": "test"}), b'{"name":"test"}'
+            )
+            mock_orjson.dumps.assert_called_once_with({"name": "test"})
+
+    def test_request_json_fallback(self):
+        with mock.patch.object(api_requests, "orjson", None):
+            self.assertEqual(
+                request_json({"name": "test"}), b'{"name": "test"}'
+            )
+
+
+class TestCreateSession(TestCase):
+
+    def test_create_session(self):
+        session = create_session(pool_connections=2, pool_maxsize=4)
+        self.assertTrue(isinstance(session, requests.Session))
+        adapter = session.get_adapter("https://test_server")
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 5)
+        session.close()
+
+
+class TestDefaultSession(TestCase):
+
+    def test_default_session(self):
+        swap(self, api_requests, "_DEFAULT_SESSION", None)
+        session = default_session()
+        self.addCleanup(session.close)
+        self.assertTrue(isinstance(session, requests.Session))
+        self.assertIs(default_session(), session)
+
+    def test_used_without_session(self):
+        session = mock.Mock()
+        session.put.return_value = _FAKE_RESP_PUT
+        swap(self, api_requests, "_DEFAULT_SESSION", session)
+        self.assertEqual(put_part("test_url", b"data"), _FAKE_RESP_PUT)
+        session.put.assert_called_once_with(
+            "test_url", data=b"data"
+        )
+
+
+class TestCreateRetry(MockLoggingMixin, TestCase):
+
+    def test_create_retry(self):
+        retry = create_retry(total=3, backoff_factor=1)
+        self.assertEqual(retry.total, 3)
+        self.assertEqual(retry.backoff_factor, 1)
+        self.assertTrue(retry.is_retry("PUT", 503))
+        self.assertTrue(retry.is_retry("GET", 429))
+        self.assertFalse(retry.is_retry("GET", 404))
+        self.assertFalse(retry.is_retry("POST", 503))
+
+    def test_increment(self):
+        retry = create_retry(total=3)
+        retry = retry.increment("GET", "/v1/files", response=mock.Mock(
+            status=503, get_redirect_location=mock.Mock(return_value=None)
+        ))
+        self.assertEqual(retry.total, 2)
+        self.assertEqual(
+            self.mock_handler.messages["warning"],
+            ["Retrying GET request to </v1/files>, 2 retries left"]
+        )
+
+
+@skipIf(httpx is None, "httpx[http2] is not installed")
+class TestHTTP2Session(TestCase):
+
+    def setUp(self):
+        self.session = HTTP2Session()
+        self.addCleanup(self.session.close)
+
+    def _mock_transport(self, status_code=200):
+        def handler(request):
+            return httpx.Response(status_code, json={"token": "test_token"})
+
+        self.session.client.close()
+        self.session.client = httpx.Client(
+            transport=httpx.MockTransport(handler)
+        )
+
+    def test_init(self):
+        self.assertTrue(isinstance(self.session.client, httpx.Client))
+        self.assertTrue(
+            isinstance(self.session.upload_session, requests.Session)
+        )
+
+    def test_post(self):
+        self._mock_transport()
+        res = self.session.post(
+            "https://test_server/v1/authorize", data=b'{"name": "test"}'
+        )
+        self.assertTrue(res.ok)
+        self.assertEqual(res.json(), {"token": "test_token"})
+        self.assertIn(b'"test"', res.request.body)
+
+    def test_get_fail(self):
+        self._mock_transport(status_code=403)
+        res = self.session.get("https://test_server/v1/files")
+        self.assertFalse(res.ok)
+
+    def test_get_retry(self):
+        statuses = [503, 429, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={})
+
+        self.session.client.close()
+        self.session.client = httpx.Client(
+            transport=httpx.MockTransport(handler)
+        )
+        with mock.patch.object(api_requests.time, "sleep") as mock_sleep:
+            res = self.session.get("https://test_server/v1/files")
+        self.assertTrue(res.ok)
+        self.assertEqual(statuses, [])
+        self.assertEqual(
+            mock_sleep.call_args_list, [mock.call(0.5), mock.call(1.0)]
+        )
+
+    def test_get_retry_exhausted(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("dummy error")
+            return httpx.Response(
+                503, headers={"Retry-After": "3"}, json={}
+            )
+
+        self.session.close()
+        self.session = HTTP2Session(total=2)
+        self.addCleanup(self.session.close)
+        self.session.client = httpx.Client(
+            transport=httpx.MockTransport(handler)
+        )
+        with mock.patch.object(api_requests.time, "sleep") as mock_sleep:
+            res = self.session.get("https://test_server/v1/files")
+        self.assertEqual(res.status_code, 503)
+        self.assertFalse(res.ok)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(
+            mock_sleep.call_args_list, [mock.call(0.5), mock.call(3)]
+        )
+
+    def test_put(self):
+        with mock.patch.object(
+            self.session.upload_session, "put", new=mock.Mock()
+        ) as mock_put:
+            self.session.put("https://test_s3", data=b"data")
+            mock_put.assert_called_once_with("https://test_s3", data=b"data")
+
 
 class TestWTHTTP(TestCase):
+    expected_agent = _EXPECTED_AGENT
+    expected_headers = _EXPECTED_HEADERS
+
     def setUp(self):
-        self.kwargs = {
-            "key": "test_key",
-            "token": "test_token",
-            "server": "test_server",
-        }
-        self.expected_agent = "WT python SDK v{0}".format(__version__)
-        self.expected_headers = {
-            "User-Agent": self.expected_agent,
-            "Content-Type": "application/json",
-            "x-api-key": self.kwargs["key"],
-            "Authorization": "Bearer {0}".format(self.kwargs["token"])
-        }
+        self.kwargs = _KWARGS.copy()
 
     def test_init(self):
         wthttp = WTHTTP(**self.kwargs)
@@ -183,8 +484,24 @@ class TestWTHTTP(TestCase):
         kwargs["headers"] = custom_headers
         wthttp = WTHTTP(**kwargs)
         headers = wthttp.get_headers()
-        self.expected_headers["my_header"] = "my_value"
-        self.assertEqual(headers, self.expected_headers)
+        self.assertEqual(
+            headers, dict(self.expected_headers, my_header="my_value")
+        )
+
+    def test_get_headers_prebuilt(self):
+        kwargs = self.kwargs.copy()
+        prebuilt = {"x-api-key": "prebuilt_key"}
+        kwargs["headers_prebuilt"] = prebuilt
+        wthttp = WTHTTP(**kwargs)
+        self.assertIs(wthttp.get_headers(), prebuilt)
+
+        kwargs["headers"] = {"my_header": "my_value"}
+        wthttp = WTHTTP(**kwargs)
+        headers = wthttp.get_headers()
+        self.assertEqual(
+            headers, {"x-api-key": "prebuilt_key", "my_header": "my_value"}
+        )
+        self.assertEqual(prebuilt, {"x-api-key": "prebuilt_key"})
 
     def test_build_url(self):
         kwargs = self.kwargs
@@ -192,73 +509,67 @@ class TestWTHTTP(TestCase):
         wthttp.build_url()
         self.assertEqual(wthttp.url, "https://test_server")
 
+    def test_build_url_base_url(self):
+        kwargs = self.kwargs.copy()
+        kwargs["base_url"] = "https://prebuilt_server"
+        wthttp = WTHTTP(**kwargs)
+        self.assertEqual(wthttp.url, "https://prebuilt_server")
+
 
-class TestWTGet(TestCase):
+class TestWTGet(MockLoggingMixin, TestCase):
     def setUp(self):
-        self.kwargs = {
-            "key": "test_key",
-            "token": "test_token",
-            "server": "test_server",
-        }
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
-        self.mock_handler = MockLoggingHandler()
-        LOGGER.addHandler(self.mock_handler)
+        super(TestWTGet, self).setUp()
+        self.kwargs = _KWARGS.copy()
 
     def test_get(self):
-        exp_res = FakeResponse()
+        exp_res = _FAKE_RESP_GET
 
-        expected_request_output = (
-            "{0} request to <{1}> with headers:<{2}> and "
-            "body:<{3}>"
-        ).format(
+        expected_request_output = _REQ_TEMPLATE % (
             exp_res.request.method, exp_res.request.url,
             exp_res.request.headers, exp_res.request.body
         )
 
-        expected_response_output = (
-            " {0} <{1}> response from <{2}> with headers:<{3}> and "
-            "body:<{4}>"
-        ).format(
+        expected_response_output = _RESP_TEMPLATE % (
             exp_res.request.method, exp_res.status_code, exp_res.url,
             exp_res.headers, exp_res.text
         )
 
-        with mock.patch('requests.get') as mock_get:
-            mock_get.return_value = exp_res
-            wtget = WTGet(**self.kwargs)
-            res = wtget.get()
+        swap(self, default_session(), "get", mock.Mock(return_value=exp_res))
+        wtget = WTGet(**self.kwargs)
+        res = wtget.get()
 
-            self.assertEqual(res, exp_res)
+        self.assertEqual(res, exp_res)
 
-            self.assertEqual(
-                expected_request_output, self.mock_handler.messages["debug"][0]
-            )
+        self.assertEqual(
+            expected_request_output, self.mock_handler.messages["debug"][0]
+        )
 
-            self.assertEqual(
-                expected_response_output, self.mock_handler.messages["debug"][1]
-            )
+        self.assertEqual(
+            expected_response_output, self.mock_handler.messages["debug"][1]
+        )
 
+    def test_get_session(self):
+        exp_res = _FAKE_RESP_GET
+        session = mock.Mock()
+        session.get.return_value = exp_res
+        self.kwargs["session"] = session
+        wtget = WTGet(**self.kwargs)
+        res = wtget.get()
+
+        self.assertEqual(res, exp_res)
+        session.get.assert_called_once_with(
+            wtget.url, **wtget.http_method_args
+        )
 
-class TestWTPost(TestCase):
+
+class TestWTPost(MockLoggingMixin, TestCase):
+
+    expected_agent = _EXPECTED_AGENT
+    expected_headers = _EXPECTED_HEADERS
 
     def setUp(self):
-        self.kwargs = {
-            "key": "test_key",
-            "token": "test_token",
-            "server": "test_server",
-        }
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
-        self.mock_handler = MockLoggingHandler()
-        LOGGER.addHandler(self.mock_handler)
-        self.expected_agent = "WT python SDK v{0}".format(__version__)
-        self.expected_headers = {
-            "User-Agent": self.expected_agent,
-            "Content-Type": "application/json",
-            "x-api-key": self.kwargs["key"],
-            "Authorization": "Bearer {0}".format(self.kwargs["token"])
-        }
+        super(TestWTPost, self).setUp()
+        self.kwargs = _KWARGS.copy()
 
     def test_init(self):
         wtpost = WTPost(**self.kwargs)
@@ -275,67 +586,49 @@ class TestWTPost(TestCase):
             def _construct_post_data(self):
                 pass
 
-        exp_res = FakeResponse(request_method="POST")
+        exp_res = _FAKE_RESP_POST
 
-        expected_request_output = (
-            "{0} request to <{1}> with headers:<{2}> and "
-            "body:<{3}>"
-        ).format(
+        expected_request_output = _REQ_TEMPLATE % (
             exp_res.request.method, exp_res.request.url,
             exp_res.request.headers, exp_res.request.body
         )
 
-        expected_response_output = (
-            " {0} <{1}> response from <{2}> with headers:<{3}> and "
-            "body:<{4}>"
-        ).format(
+        expected_response_output = _RESP_TEMPLATE % (
             exp_res.request.method, exp_res.status_code, exp_res.url,
             exp_res.headers, exp_res.text
         )
 
-        with mock.patch('requests.post') as mock_post:
-            mock_post.return_value = exp_res
-            cl = FakeWTPostImplementation(**self.kwargs)
-            res = cl.post()
-            self.assertEqual(res, exp_res)
-            expected_method_args = {
-                "headers": self.expected_headers,
-                "json": {},
-            }
-            self.assertEqual(cl.http_method_args, expected_method_args)
-            self.assertEqual(
-                expected_request_output, self.mock_handler.messages["debug"][0]
-            )
+        swap(self, default_session(), "post", mock.Mock(return_value=exp_res))
+        cl = FakeWTPostImplementation(**self.kwargs)
+        res = cl.post()
+        self.assertEqual(res, exp_res)
+        expected_method_args = {
+            "headers": self.expected_headers,
+            "data": b"{}",
+        }
+        self.assertEqual(cl.http_method_args, expected_method_args)
+        self.assertEqual(
+            expected_request_output, self.mock_handler.messages["debug"][0]
+        )
 
-            self.assertEqual(
-                expected_response_output, self.mock_handler.messages["debug"][1]
-            )
+        self.assertEqual(
+            expected_response_output, self.mock_handler.messages["debug"][1]
+        )
 
 
-class WTPostTestBase(object):
+class WTPostTestBase(MockLoggingMixin):
+
+    expected_agent = _EXPECTED_AGENT
+    expected_headers = _EXPECTED_HEADERS
 
     def setUp(self):
-        self.kwargs = {
-            "key": "test_key",
-            "token": "test_token",
-            "server": "test_server",
-        }
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
-        self.mock_handler = MockLoggingHandler()
-        LOGGER.addHandler(self.mock_handler)
-        self.expected_agent = "WT python SDK v{0}".format(__version__)
-        self.expected_headers = {
-            "User-Agent": self.expected_agent,
-            "Content-Type": "application/json",
-            "x-api-key": self.kwargs["key"],
-            "Authorization": "Bearer {0}".format(self.kwargs["token"])
-        }
+        super(WTPostTestBase, self).setUp()
+        self.kwargs = _KWARGS.copy()
 
     def get_test_object(self):
         pass
 
-    def get_mock_path(self):
+    def get_mock_class(self):
         pass
 
     def test_init(self):
@@ -343,15 +636,15 @@ class WTPostTestBase(object):
         self.assertEqual(obj.url_path, obj.URL_PATH)
 
     def test_create(self):
-        exp_res = FakeResponse(request_method="POST")
-        with mock.patch('requests.post') as mock_post:
-            mock_post.return_value = exp_res
-            obj = self.get_test_object()
-            res = obj.create()
-            self.assertEqual(res, exp_res)
+        exp_res = _FAKE_RESP_POST
+        swap(self, default_session(), "post", mock.Mock(return_value=exp_res))
+        obj = self.get_test_object()
+        res = obj.create()
+        self.assertEqual(res, exp_res)
 
-        path = self.get_mock_path()
-        with mock.patch(path) as mock_ok:
+        with mock.patch.object(
+            self.get_mock_class(), "post", new=mock.Mock()
+        ) as mock_ok:
             obj = self.get_test_object()
             res = obj.create()
             mock_ok.assert_called_once()
@@ -362,8 +655,8 @@ class TestAuthorize(WTPostTestBase, TestCase):
     def get_test_object(self):
         return Authorize(**self.kwargs)
 
-    def get_mock_path(self):
-        return "wetransfer.api_requests.Authorize.post"
+    def get_mock_class(self):
+        return Authorize
 
 
 class TestCreateTransfer(WTPostTestBase, TestCase):
@@ -372,8 +665,8 @@ class TestCreateTransfer(WTPostTestBase, TestCase):
         self.kwargs.update({"name": "Dummy Transfer"})
         return CreateTransfer(**self.kwargs)
 
-    def get_mock_path(self):
-        return "wetransfer.api_requests.CreateTransfer.post"
+    def get_mock_class(self):
+        return CreateTransfer
 
     def test_construct_data(self):
         self.kwargs.update({"name": "Dummy Transfer"})
@@ -385,23 +678,23 @@ class TestCreateTransfer(WTPostTestBase, TestCase):
 
 class TestAddItems(WTPostTestBase, TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        super(TestAddItems, cls).setUpClass()
+        cls.items = [
+            Link("https://wetransfer.com/", "WeTransfer Website"),
+            File(__file__)
+        ]
+
     def setUp(self):
         super(TestAddItems, self).setUp()
-        print(os.path.abspath(__file__))
-        print(__file__)
-        self.kwargs.update({
-            "transfer_id": 1,
-            "items": [
-                Link("https://wetransfer.com/", "WeTransfer Website"),
-                File(__file__)
-            ]
-        })
+        self.kwargs.update({"transfer_id": 1, "items": list(self.items)})
 
     def get_test_object(self):
         return AddItems(**self.kwargs)
 
-    def get_mock_path(self):
-        return "wetransfer.api_requests.AddItems.post"
+    def get_mock_class(self):
+        return AddItems
 
     def test_init(self):
         obj = self.get_test_object()
@@ -425,19 +718,15 @@ class TestFinishUpload(WTPostTestBase, TestCase):
     def setUp(self):
         super(TestFinishUpload, self).setUp()
         self.kwargs = {
-            "client_options": {
-                "key": "test_key",
-                "token": "test_token",
-                "server": "test_server",
-            },
+            "client_options": _KWARGS.copy(),
             "id": 1
         }
 
     def get_test_object(self):
         return FinishUpload(**self.kwargs)
 
-    def get_mock_path(self):
-        return "wetransfer.api_requests.FinishUpload.post"
+    def get_mock_class(self):
+        return FinishUpload
 
     def test_init(self):
         obj = self.get_test_object()
@@ -447,13 +736,7 @@ class TestFinishUpload(WTPostTestBase, TestCase):
         )
 
 
-class TestUploadPart(TestCase):
-
-    def setUp(self):
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
-        self.mock_handler = MockLoggingHandler()
-        LOGGER.addHandler(self.mock_handler)
+class TestUploadPart(MockLoggingMixin, TestCase):
 
     def test_init(self):
         test_url = "test_url"
@@ -461,59 +744,57 @@ class TestUploadPart(TestCase):
         wtupload = UploadPart(test_url, test_data)
         self.assertEqual(wtupload.url, test_url)
         self.assertEqual(wtupload.data, test_data)
+        self.assertEqual(wtupload.session, None)
+
+    def test_create_session(self):
+        exp_res = _FAKE_RESP_PUT
+        session = mock.Mock()
+        session.put.return_value = exp_res
+        wtupload = UploadPart("test_url", "test_data", session=session)
+        res = wtupload.create()
+        self.assertEqual(res, exp_res)
+        session.put.assert_called_once_with(
+            "test_url", data="test_data"
+        )
 
     def test_create(self):
-        exp_res = FakeResponse(request_method="PUT")
+        exp_res = _FAKE_RESP_PUT
 
-        expected_request_output = (
-            "{0} request to <{1}> with headers:<{2}> and "
-            "body:<>"
-        ).format(
+        expected_request_output = _REQ_TEMPLATE % (
             exp_res.request.method, exp_res.request.url,
-            exp_res.request.headers
+            exp_res.request.headers, ""
         )
 
-        expected_response_output = (
-            " {0} <{1}> response from <{2}> with headers:<{3}> and "
-            "body:<{4}>"
-        ).format(
+        expected_response_output = _RESP_TEMPLATE % (
             exp_res.request.method, exp_res.status_code, exp_res.url,
             exp_res.headers, exp_res.text
         )
 
-        with mock.patch('requests.put') as mock_put:
-            mock_put.return_value = exp_res
-            test_url = "test_url"
-            test_data = "test_data"
-            wtupload = UploadPart(test_url, test_data)
-            res = wtupload.create()
-            self.assertEqual(res, exp_res)
-            self.assertEqual(
-                expected_request_output, self.mock_handler.messages["debug"][0]
-            )
+        swap(self, default_session(), "put", mock.Mock(return_value=exp_res))
+        test_url = "test_url"
+        test_data = "test_data"
+        wtupload = UploadPart(test_url, test_data)
+        res = wtupload.create()
+        self.assertEqual(res, exp_res)
+        self.assertEqual(
+            expected_request_output, self.mock_handler.messages["debug"][0]
+        )
 
-            self.assertEqual(
-                expected_response_output, self.mock_handler.messages["debug"][1]
-            )
+        self.assertEqual(
+            expected_response_output, self.mock_handler.messages["debug"][1]
+        )
 
 
-class TestGetUploadURL(TestCase):
+class TestGetUploadURL(MockLoggingMixin, TestCase):
 
     def setUp(self):
+        super(TestGetUploadURL, self).setUp()
         self.kwargs = {
-            "client_options": {
-                "key": "test_key",
-                "token": "test_token",
-                "server": "test_server",
-            },
+            "client_options": _KWARGS.copy(),
             "id": 1,
             "part_number": 1,
             "multipart_upload_id": 1
         }
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
-        self.mock_handler = MockLoggingHandler()
-        LOGGER.addHandler(self.mock_handler)
 
     def test_init(self):
         obj = GetUploadURL(**self.kwargs)
@@ -526,19 +807,72 @@ class TestGetUploadURL(TestCase):
             })
         )
 
+    def test_url_affixes(self):
+        prefix, suffix = GetUploadURL.url_affixes("https://test_server", 1, 2)
+        self.assertEqual(prefix, "https://test_server/v1/files/1/uploads/")
+        self.assertEqual(suffix, "/2")
+
+        prefix, suffix = GetUploadURL.url_affixes("https://test_server", 1, 1)
+        obj = GetUploadURL(**self.kwargs)
+        self.assertEqual(obj.url, prefix + "1" + suffix)
+
     def test_create(self):
-        exp_res = FakeResponse(request_method="GET")
-        with mock.patch('requests.get') as mock_get:
-            mock_get.return_value = exp_res
-            obj = GetUploadURL(**self.kwargs)
-            res = obj.create()
-            self.assertEqual(res, exp_res)
+        exp_res = _FAKE_RESP_GET
+        swap(self, default_session(), "get", mock.Mock(return_value=exp_res))
+        obj = GetUploadURL(**self.kwargs)
+        res = obj.create()
+        self.assertEqual(res, exp_res)
 
-        path = "wetransfer.api_requests.GetUploadURL.get"
-        with mock.patch(path) as mock_ok:
+        with mock.patch.object(
+            api_requests, "get_upload_url", new=mock.Mock()
+        ) as mock_get:
             obj = GetUploadURL(**self.kwargs)
             res = obj.create()
-            mock_ok.assert_called_once()
+            mock_get.assert_called_once_with(
+                obj.url, _EXPECTED_HEADERS, None
+            )
+            self.assertEqual(res, mock_get.return_value)
+
+
+class TestPartFunctions(MockLoggingMixin, TestCase):
+
+    def test_get_upload_url(self):
+        exp_res = _FAKE_RESP_GET
+        session = mock.Mock()
+        session.get.return_value = exp_res
+        headers = {"header1": "test1"}
+        res = get_upload_url("test_url", headers, session)
+        self.assertEqual(res, exp_res)
+        session.get.assert_called_once_with("test_url", headers=headers)
+        self.assertEqual(len(self.mock_handler.messages["debug"]), 2)
+
+    def test_put_part(self):
+        exp_res = _FAKE_RESP_PUT
+        session = mock.Mock()
+        session.put.return_value = exp_res
+        res = put_part("test_url", b"test_data", session)
+        self.assertEqual(res, exp_res)
+        session.put.assert_called_once_with(
+            "test_url", data=b"test_data"
+        )
+        self.assertEqual(len(self.mock_handler.messages["debug"]), 2)
+
+    def test_put_part_memoryview_length(self):
+        """
+        Tests requests sends a memoryview part with its Content-Length, and
+        not chunked, without put_part setting the header itself.
+        """
+        part = memoryview(b"0123456789")[2:8]
+        request = requests.Request("PUT", "https://test_s3", data=part)
+        headers = request.prepare().headers
+        self.assertEqual(headers["Content-Length"], "6")
+        self.assertNotIn("Transfer-Encoding", headers)
+
+    def test_without_session(self):
+        mock_get = mock.Mock(return_value=_FAKE_RESP_GET)
+        swap(self, default_session(), "get", mock_get)
+        get_upload_url("test_url", {})
+        mock_get.assert_called_once_with("test_url", headers={})
 
 
 if __name__ == '__main__':
@@ -1,26 +1,24 @@
 """Module that implements tests for wetransfer client module."""
 import os
+import json
 import re
 import mock
 import logging
 import tempfile
+import requests
 from unittest import skip, main, TestCase
+import wetransfer.client
+from wetransfer.api_requests import Authorize
 from wetransfer.client import WTApiClient
 from wetransfer.logger import LOGGER
 from wetransfer.transfer import Transfer
+from wetransfer.token_cache import TokenCache
 
 
 class MockLoggingHandler(logging.Handler):
     """Mock logging handler to check for expected logs."""
 
     def __init__(self, *args, **kwargs):
-        self.reset()
-        logging.Handler.__init__(self, *args, **kwargs)
-
-    def emit(self, record):
-        self.messages[record.levelname.lower()].append(record.getMessage())
-
-    def reset(self):
         self.messages = {
             'debug': [],
             'info': [],
@@ -28,6 +26,14 @@ class MockLoggingHandler(logging.Handler):
             'error': [],
             'critical': [],
         }
+        logging.Handler.__init__(self, *args, **kwargs)
+
+    def emit(self, record):
+        self.messages[record.levelname.lower()].append(record.getMessage())
+
+    def reset(self):
+        for messages in self.messages.values():
+            messages.clear()
 
 
 class FakeResponse(object):
@@ -44,6 +50,25 @@ class FakeResponse(object):
     def json(self):
         return self.json_res
 
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode("utf-8")
+
+
+# A single handler is installed for the tests of this module and reset by
+# every test using it, rather than a new one being added for each test.
+_MOCK_HANDLER = MockLoggingHandler()
+
+
+def setUpModule():
+    logging.basicConfig()
+    logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
+    LOGGER.addHandler(_MOCK_HANDLER)
+
+
+def tearDownModule():
+    LOGGER.removeHandler(_MOCK_HANDLER)
+
 
 class TestTransfer(TestCase):
     """Test class to host main tests for Transfer class in client package."""
@@ -51,11 +76,15 @@ class TestTransfer(TestCase):
         self.key = "dummy_key"
         self.server = "dummy_server"
         self.client = WTApiClient(**{"key": self.key, "server": self.server})
+        _MOCK_HANDLER.reset()
+        self.mock_handler = _MOCK_HANDLER
 
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
-        self.mock_handler = MockLoggingHandler()
-        LOGGER.addHandler(self.mock_handler)
+    def test_mock_handler_installed_once(self):
+        """Tests the logging handler is not added again for every test."""
+        handlers = [
+            h for h in LOGGER.handlers if isinstance(h, MockLoggingHandler)
+        ]
+        self.assertEqual(handlers, [self.mock_handler])
 
     def test_init(self):
         """
@@ -64,14 +93,24 @@ class TestTransfer(TestCase):
         """
         self.assertEqual(self.client.server, self.server)
         self.assertEqual(self.client.key, self.key)
+        self.assertTrue(isinstance(self.client.session, requests.Session))
+
+    def test_init_http2(self):
+        """Tests the client makes API calls over HTTP/2 when asked to."""
+        with mock.patch.object(
+            wetransfer.client, "HTTP2Session", new=mock.Mock()
+        ) as mock_session:
+            client = WTApiClient(key=self.key, use_http2=True)
+            self.assertIs(client.session, mock_session.return_value)
 
     def test_authorize_fail(self):
         """
         Tests the autorize method of the class in case Authorize API call fails and
         we return False.
         """
-        with mock.patch('wetransfer.api_requests.Authorize.create') as mock_create:
-            mock_create.return_value = FakeResponse(ok=False)
+        with mock.patch.object(
+            Authorize, "create", new=mock.Mock(return_value=FakeResponse(ok=False))
+        ) as mock_create:
             r = self.client.authorize()
             self.assertFalse(r)
             self.assertEqual(
@@ -84,8 +123,9 @@ class TestTransfer(TestCase):
         Tests the autorize method of the class in case Authorize API call succeeds
         but there is no "token" keyword in response.
         """
-        with mock.patch('wetransfer.api_requests.Authorize.create') as mock_create:
-            mock_create.return_value = FakeResponse(ok=True, json={})
+        with mock.patch.object(
+            Authorize, "create", new=mock.Mock(return_value=FakeResponse(ok=True, json={}))
+        ) as mock_create:
             r = self.client.authorize()
             self.assertFalse(r)
             self.assertEqual(
@@ -98,22 +138,28 @@ class TestTransfer(TestCase):
         Tests the autorize method of the class in case Authorize API call succeeds
         and json response is valid and we return True.
         """
-        with mock.patch('wetransfer.api_requests.Authorize.create') as mock_create:
-            mock_create.return_value = FakeResponse(ok=True)
+        with mock.patch.object(
+            Authorize, "create", new=mock.Mock(return_value=FakeResponse(ok=True))
+        ) as mock_create:
             r = self.client.authorize()
             self.assertTrue(r)
             self.assertEqual(
                 "Successfully authorized",
                 self.mock_handler.messages["info"][0]
             )
+            self.assertEqual(
+                self.client.headers_prebuilt["Authorization"],
+                "Bearer dummy_token"
+            )
 
     def test_create_success(self):
         """
         Tests the create method of the class in cases where everything goes well and
          we return True.
         """
-        with mock.patch('wetransfer.transfer.Transfer.create') as mock_create:
-            mock_create.return_value = True
+        with mock.patch.object(
+            Transfer, "create", new=mock.Mock(return_value=True)
+        ) as mock_create:
             r = self.client.create_transfer()
             self.assertTrue(isinstance(r, Transfer))
             self.assertEqual(r.name, "WT Transfer")
@@ -123,19 +169,131 @@ class TestTransfer(TestCase):
         Tests the create method of the class in cases where everything goes well
         and we specify a different name than the default for the Transfer
         """
-        with mock.patch('wetransfer.transfer.Transfer.create') as mock_create:
-            mock_create.return_value = True
+        with mock.patch.object(
+            Transfer, "create", new=mock.Mock(return_value=True)
+        ) as mock_create:
             r = self.client.create_transfer(transfer_name="Dummy Transfer")
             self.assertTrue(isinstance(r, Transfer))
             self.assertEqual(r.name, "Dummy Transfer")
 
+    def test_authorize_cached(self):
+        """
+        Tests the autorize method of the class uses a token found in the token
+        cache instead of calling the Authorize API.
+        """
+        cache = mock.Mock()
+        cache.get.return_value = "cached_token"
+        client = WTApiClient(key=self.key, server=self.server, token_cache=cache)
+        with mock.patch.object(
+            Authorize, "create", new=mock.Mock()
+        ) as mock_create:
+            r = client.authorize()
+            self.assertTrue(r)
+            self.assertEqual(mock_create.call_count, 0)
+            cache.get.assert_called_once_with(self.key, "https://dummy_server")
+            self.assertEqual(client.token, "cached_token")
+            self.assertEqual(
+                client.headers_prebuilt["Authorization"], "Bearer cached_token"
+            )
+
+    def test_authorize_cache_miss(self):
+        """
+        Tests the autorize method of the class calls the Authorize API and
+        stores the token in the token cache when there is no cached token.
+        """
+        cache = mock.Mock()
+        cache.get.return_value = None
+        client = WTApiClient(key=self.key, server=self.server, token_cache=cache)
+        with mock.patch.object(
+            Authorize, "create", new=mock.Mock(return_value=FakeResponse(ok=True))
+        ) as mock_create:
+            r = client.authorize()
+            self.assertTrue(r)
+            self.assertEqual(mock_create.call_count, 1)
+            cache.set.assert_called_once_with(
+                self.key, "https://dummy_server", "dummy_token"
+            )
+
+    def test_authorize_without_cache(self):
+        """
+        Tests the autorize method of the class ignores a cached token with
+        use_cache=False and replaces it with the one from the Authorize API.
+        """
+        cache = mock.Mock()
+        cache.get.return_value = "cached_token"
+        client = WTApiClient(key=self.key, server=self.server, token_cache=cache)
+        with mock.patch.object(
+            Authorize, "create", new=mock.Mock(return_value=FakeResponse(ok=True))
+        ) as mock_create:
+            r = client.authorize(use_cache=False)
+            self.assertTrue(r)
+            self.assertEqual(mock_create.call_count, 1)
+            cache.get.assert_not_called()
+            cache.set.assert_called_once_with(
+                self.key, "https://dummy_server", "dummy_token"
+            )
+            self.assertEqual(client.token, "dummy_token")
+
+    def test_token_cache_default(self):
+        """Tests token_cache=True uses a TokenCache with the default path"""
+        client = WTApiClient(key=self.key, token_cache=True)
+        self.assertTrue(isinstance(client.token_cache, TokenCache))
+        self.assertIsNone(self.client.token_cache)
+
+    def test_authorize_session(self):
+        """
+        Tests the autorize method of the class passes the client's session to
+        the Authorize API call.
+        """
+        with mock.patch.object(
+            wetransfer.client, "Authorize", new=mock.Mock()
+        ) as mock_authorize:
+            mock_authorize.return_value.create.return_value = FakeResponse(ok=True)
+            self.client.authorize()
+            _, kwargs = mock_authorize.call_args
+            self.assertIs(kwargs["session"], self.client.session)
+
+    def test_create_session(self):
+        """
+        Tests the create method of the class shares the client's session with
+        the Transfer it creates.
+        """
+        with mock.patch.object(
+            Transfer, "create", new=mock.Mock(return_value=True)
+        ) as mock_create:
+            r = self.client.create_transfer()
+            self.assertIs(r.client_options["session"], self.client.session)
+            self.assertEqual(r.client_options["base_url"], "https://dummy_server")
+            self.assertIs(
+                r.client_options["headers_prebuilt"],
+                self.client.headers_prebuilt
+            )
+
+    def test_close(self):
+        """Tests the close method of the class closes the shared session."""
+        with mock.patch.object(
+            self.client.session, "close", new=mock.Mock()
+        ) as mock_close:
+            self.client.close()
+            mock_close.assert_called_once_with()
+
+    def test_context_manager(self):
+        """Tests the client closes its session when used as a context manager."""
+        with mock.patch.object(
+            WTApiClient, "close", new=mock.Mock()
+        ) as mock_close:
+            with WTApiClient(key=self.key) as client:
+                self.assertTrue(isinstance(client, WTApiClient))
+            mock_close.assert_called_once_with()
+
     def test_create_fail(self):
         """
         Tests the create method of the class in cases where Transfer API call fails
         and we return None.
         """
-        with mock.patch('wetransfer.transfer.Transfer.create') as mock_create:
-            mock_create.return_value = None
+        with mock.patch.object(
+            Transfer, "create", new=mock.Mock(return_value=None)
+        ) as mock_create:
             r = self.client.create_transfer()
             self.assertIsNone(r)
 
@@ -1,16 +1,35 @@
 """Module that implements tests for wetransfer items module."""
 import os
+import json
+import mmap
 import re
-import six
 import mock
 import logging
 import tempfile
+from collections import deque
 from unittest import skip, main, TestCase
 
 from wetransfer.items import File, Link
 from wetransfer.logger import LOGGER
 
 
+_FILE_STR_PATTERN = re.compile(
+    r"Transfer item, file type, with size 6, name \S+, and local path"
+    r" \S+, has None multi parts"
+)
+_LINK_STR_PATTERN = re.compile(
+    r"Transfer item, link type, with title \S+ \S+, url \S+ and local "
+    r"identifier \S+"
+)
+# Shared by every FakeResponse, none of the tests mutates it
+_FILE_FAKE_JSON = {"upload_url": "test_dummy_url"}
+
+
+def setUpModule():
+    logging.basicConfig()
+    logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
+
+
 class MockLoggingHandler(logging.Handler):
     """Mock logging handler to check for expected logs."""
 
@@ -19,16 +38,19 @@ class MockLoggingHandler(logging.Handler):
         logging.Handler.__init__(self, *args, **kwargs)
 
     def emit(self, record):
-        self.messages[record.levelname.lower()].append(record.getMessage())
+        # Standard levels are multiples of 10, DEBUG (10) to CRITICAL (50)
+        self._buckets[record.levelno // 10].append(record.getMessage())
 
     def reset(self):
-        self.messages = {
-            'debug': [],
-            'info': [],
-            'warning': [],
-            'error': [],
-            'critical': [],
-        }
+        self.debug = deque()
+        self.info = deque()
+        self.warning = deque()
+        self.error = deque()
+        self.critical = deque()
+        self._buckets = (
+            None, self.debug, self.info, self.warning, self.error,
+            self.critical
+        )
 
 
 class FakeResponse(object):
@@ -40,19 +62,84 @@ class FakeResponse(object):
         self.ok = ok
 
     def json(self):
-        return {"upload_url": "test_dummy_url"}
+        return _FILE_FAKE_JSON
+
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode("utf-8")
+
+
+def recording_upload_part(recorder):
+    """
+    Returns a File.upload_part replacement passing copies of the parts it is
+    given to recorder, as those are views released once the upload is done.
+    """
+    def upload_part(item, part, part_number):
+        return recorder(bytes(part), part_number)
+
+    return upload_part
+
+
+class PatchersMixin(object):
+    """
+    Mixin starting the patchers make_patchers returns once for all the tests
+    of a class, their mocks in order in mocks, and stopping them afterwards.
+    """
+
+    @classmethod
+    def make_patchers(cls):
+        """Returns the patchers to start for the tests of the class."""
+        return []
+
+    @classmethod
+    def setUpClass(cls):
+        super(PatchersMixin, cls).setUpClass()
+        cls.patchers = cls.make_patchers()
+        cls.mocks = [patcher.start() for patcher in cls.patchers]
+
+    @classmethod
+    def tearDownClass(cls):
+        for patcher in reversed(cls.patchers):
+            patcher.stop()
+        super(PatchersMixin, cls).tearDownClass()
 
 
-class TestFileItem(TestCase):
+class TempFileMixin(object):
+    """
+    Mixin creating the file the tests of a class upload once, rather than
+    for every test. Tests must only read it.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TempFileMixin, cls).setUpClass()
+        cls.temp_file = tempfile.NamedTemporaryFile()
+        cls.temp_file.write(b"123456")
+        cls.temp_file.flush()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_file.close()
+        super(TempFileMixin, cls).tearDownClass()
+
+    @staticmethod
+    def set_chunk_size(item, chunk_size):
+        """
+        Sets the chunk size of item, with as many parts as the API would then
+        have allocated for it.
+        """
+        item.CHUNK_SIZE = chunk_size
+        item.multipart_parts = -(-item.filesize // chunk_size)
+
+
+class TestFileItem(TempFileMixin, TestCase):
     """Test class to host main tests for File class in items package."""
     def setUp(self):
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
         self.mock_handler = MockLoggingHandler()
         LOGGER.addHandler(self.mock_handler)
-        self.temp_file = tempfile.NamedTemporaryFile()
-        with open(self.temp_file.name, 'w') as f:
-            f.write("123456")
+
+    def tearDown(self):
+        LOGGER.removeHandler(self.mock_handler)
 
     def test_init(self):
         """
@@ -65,6 +152,63 @@ class TestFileItem(TestCase):
         self.assertEqual(item.filesize, 6)
         self.assertEqual(item.content_identifier, "file")
         self.assertEqual(item.local_identifier, self.temp_file.name)
+        self.assertEqual(item.CHUNK_SIZE, 6291456)
+
+    def test_init_relative_path(self):
+        """Tests a relative or user path is stored as an absolute path"""
+        directory, filename = os.path.split(self.temp_file.name)
+        with mock.patch.dict(os.environ, {"HOME": directory}):
+            item = File(os.path.join("~", filename))
+        self.assertEqual(item.local_identifier, self.temp_file.name)
+        self.assertEqual(item.filename, filename)
+        self.assertEqual(item.filesize, 6)
+
+    def test_init_invalid_sizes(self):
+        """Tests non positive chunk sizes or worker counts are rejected"""
+        for kwargs in (
+            {"chunk_size": 0}, {"chunk_size": -1},
+            {"max_workers": 0}, {"max_workers": -1},
+        ):
+            with self.assertRaises(ValueError):
+                File(self.temp_file.name, **kwargs)
+
+    def test_init_path_parsed_once(self):
+        """
+        Tests the file name is parsed from the path when the File is created
+        and only read by serialize and __str__.
+        """
+        with mock.patch(
+            "wetransfer.items.os.path.split", wraps=os.path.split
+        ) as mock_split:
+            item = File(self.temp_file.name)
+            item.serialize()
+            str(item)
+        mock_split.assert_called_once_with(self.temp_file.name)
+
+    def test_init_stat_once(self):
+        """Tests the file is stat-ed once, when the File is created"""
+        with mock.patch(
+            "wetransfer.items.os.stat", wraps=os.stat
+        ) as mock_stat:
+            item = File(self.temp_file.name)
+            item.serialize()
+        mock_stat.assert_called_once_with(self.temp_file.name)
+
+    def test_init_missing_file(self):
+        """Tests a missing file fails when the File is created"""
+        with self.assertRaises(OSError):
+            File(self.temp_file.name + ".missing")
+
+    def test_init_chunk_size(self):
+        """Tests the chunk size parts are uploaded in can be set"""
+        item = File(self.temp_file.name, chunk_size=2)
+        self.assertEqual(item.CHUNK_SIZE, 2)
+
+    def test_init_max_workers(self):
+        """Tests the number of parts uploaded concurrently can be set"""
+        self.assertEqual(File(self.temp_file.name).MAX_WORKERS, 4)
+        item = File(self.temp_file.name, max_workers=8)
+        self.assertEqual(item.MAX_WORKERS, 8)
 
     def test_serialize(self):
         """
@@ -80,6 +224,19 @@ class TestFileItem(TestCase):
         }
         self.assertEqual(item.serialize(), expected_value)
 
+    def test_serialize_cached(self):
+        """
+        Tests the serialize output is built once and rebuilt when details are
+        loaded.
+        """
+        item = File(self.temp_file.name)
+        serialized = item.serialize()
+        self.assertIs(item.serialize(), serialized)
+
+        item.load_info(filename="loaded_name")
+        self.assertIsNot(item.serialize(), serialized)
+        self.assertEqual(item.serialize()["filename"], "loaded_name")
+
     def test_load_info(self):
         """
         Tests the 'load_info' method of the class and checks needed properties
@@ -102,40 +259,55 @@ class TestFileItem(TestCase):
     def test_str(self):
         """Tests the '__str__' representation of the objects of File class"""
         item = File(self.temp_file.name)
-        regexp = (
-            r"Transfer item, file type, with size 6, name \S+, and local path"
-            r" \S+, has None multi parts"
-        )
-        pattern = re.compile(regexp)
-        is_match = pattern.match(str(item))
-        self.assertTrue(is_match)
+        self.assertTrue(_FILE_STR_PATTERN.match(str(item)))
+
+    def test_str_load_info(self):
+        """
+        Tests the '__str__' representation of the objects of File class is
+        cached and refreshed when details are loaded
+        """
+        item = File(self.temp_file.name)
+        self.assertIs(str(item), str(item))
+        item.load_info(multipart_parts=2)
+        self.assertTrue(str(item).endswith("has 2 multi parts"))
 
 
-class TestFileUpload(TestCase):
+class TestFileUpload(PatchersMixin, TempFileMixin, TestCase):
     """
     Test class to host all tests for 'upload' method of File class in items
     package.
     """
+    @classmethod
+    def make_patchers(cls):
+        cls.mock_upload_part = mock.Mock()
+        return [
+            mock.patch("wetransfer.api_requests.FinishUpload.create"),
+            mock.patch(
+                "wetransfer.items.File.upload_part",
+                new=recording_upload_part(cls.mock_upload_part)
+            ),
+        ]
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestFileUpload, cls).setUpClass()
+        cls.mock_finish_upload, _ = cls.mocks
+
     def setUp(self):
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
         self.mock_handler = MockLoggingHandler()
         LOGGER.addHandler(self.mock_handler)
 
-        self.mock_finish_upload = mock.patch(
-            "wetransfer.api_requests.FinishUpload.create",
-        ).start()
-        self.mock_upload_part = mock.patch(
-            "wetransfer.items.File.upload_part",
-        ).start()
-
-        self.temp_file = tempfile.NamedTemporaryFile()
-        with open(self.temp_file.name, 'w') as f:
-            f.write("123456")
+        self.mock_finish_upload.reset_mock(return_value=True, side_effect=True)
+        self.mock_upload_part.reset_mock(return_value=True, side_effect=True)
 
         self.item = File(self.temp_file.name)
         self.item.client_options = {}
         self.item.id = 1
+        # Upload parts one at a time so calls are made in order
+        self.item.MAX_WORKERS = 1
+
+    def tearDown(self):
+        LOGGER.removeHandler(self.mock_handler)
 
     def test_upload_all_success(self):
         """
@@ -145,12 +317,12 @@ class TestFileUpload(TestCase):
         r = FakeResponse()
         self.mock_finish_upload.return_value = r
         self.mock_upload_part.return_value = True
-        self.item.CHUNK_SIZE = 2
+        self.set_chunk_size(self.item, 2)
         res = self.item.upload()
         self.assertEqual(self.mock_finish_upload.call_count, 1)
         self.assertEqual(self.mock_upload_part.call_count, 3)
         expected_call_list = [
-            mock.call('12', 1), mock.call('34', 2), mock.call('56', 3),
+            mock.call(b'12', 1), mock.call(b'34', 2), mock.call(b'56', 3),
         ]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
@@ -158,7 +330,7 @@ class TestFileUpload(TestCase):
         )
         self.assertEqual(
             "Successfully closed upload for item id: 1",
-            self.mock_handler.messages["info"][0]
+            self.mock_handler.info[0]
         )
         self.assertTrue(res)
 
@@ -170,12 +342,12 @@ class TestFileUpload(TestCase):
         r = FakeResponse(ok=False)
         self.mock_finish_upload.return_value = r
         self.mock_upload_part.return_value = True
-        self.item.CHUNK_SIZE = 2
+        self.set_chunk_size(self.item, 2)
         res = self.item.upload()
         self.assertEqual(self.mock_finish_upload.call_count, 1)
         self.assertEqual(self.mock_upload_part.call_count, 3)
         expected_call_list = [
-            mock.call('12', 1), mock.call('34', 2), mock.call('56', 3),
+            mock.call(b'12', 1), mock.call(b'34', 2), mock.call(b'56', 3),
         ]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
@@ -183,7 +355,7 @@ class TestFileUpload(TestCase):
         )
         self.assertEqual(
             "Failed closing upload for item id: 1",
-            self.mock_handler.messages["error"][0]
+            self.mock_handler.error[0]
         )
         self.assertFalse(res)
 
@@ -195,55 +367,133 @@ class TestFileUpload(TestCase):
         r = FakeResponse(ok=False)
         self.mock_finish_upload.return_value = r
         self.mock_upload_part.return_value = False
-        self.item.CHUNK_SIZE = 2
+        self.set_chunk_size(self.item, 2)
         res = self.item.upload()
         self.assertEqual(self.mock_finish_upload.call_count, 0)
         self.assertEqual(self.mock_upload_part.call_count, 1)
-        expected_call_list = [mock.call('12', 1)]
+        expected_call_list = [mock.call(b'12', 1)]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
             expected_call_list
         )
         self.assertFalse(res)
 
+    def test_upload_empty_file(self):
+        """
+        Tests the usecase where the file is empty, no part is uploaded and the
+        upload is closed
+        """
+        self.mock_finish_upload.return_value = FakeResponse()
+        empty_file = tempfile.NamedTemporaryFile()
+        item = File(empty_file.name)
+        item.client_options = {}
+        item.id = 1
+        item.multipart_parts = 0
+        res = item.upload()
+        self.assertEqual(self.mock_upload_part.call_count, 0)
+        self.assertEqual(self.mock_finish_upload.call_count, 1)
+        self.assertTrue(res)
+
+    def test_upload_concurrent(self):
+        """
+        Tests the usecase where parts are uploaded concurrently, all of them
+        are uploaded and the method returns True
+        """
+        self.mock_finish_upload.return_value = FakeResponse()
+        self.mock_upload_part.return_value = True
+        self.set_chunk_size(self.item, 2)
+        self.item.MAX_WORKERS = 3
+        res = self.item.upload()
+        self.assertEqual(self.mock_finish_upload.call_count, 1)
+        expected_call_list = [
+            mock.call(b'12', 1), mock.call(b'34', 2), mock.call(b'56', 3),
+        ]
+        self.assertEqual(
+            sorted(self.mock_upload_part.call_args_list, key=lambda c: c[0][1]),
+            expected_call_list
+        )
+        self.assertTrue(res)
+
+    def test_upload_concurrent_failure(self):
+        """
+        Tests the usecase where one of the concurrently uploaded parts fails
+        and we exit with False without closing the upload
+        """
+        self.mock_finish_upload.return_value = FakeResponse()
+        self.mock_upload_part.side_effect = lambda part, n: n != 2
+        self.set_chunk_size(self.item, 1)
+        self.item.MAX_WORKERS = 2
+        res = self.item.upload()
+        self.assertEqual(self.mock_finish_upload.call_count, 0)
+        self.assertFalse(res)
+
+    def test_upload_part_exception(self):
+        """
+        Tests the usecase where uploading a part raises and the exception is
+        propagated to the caller
+        """
+        self.mock_upload_part.side_effect = ValueError("dummy")
+        self.set_chunk_size(self.item, 2)
+        self.assertRaises(ValueError, self.item.upload)
+        self.assertEqual(self.mock_finish_upload.call_count, 0)
+
+    def test_upload_parts_mismatch(self):
+        """
+        Tests the usecase where a non default chunk size cuts the file in
+        another number of parts than the API allocated for it, nothing is
+        uploaded and we exit with False
+        """
+        item = File(self.temp_file.name, chunk_size=2)
+        item.client_options = {}
+        item.load_info(id=1, multipart_parts=1)
+        res = item.upload()
+        self.assertFalse(res)
+        self.assertEqual(self.mock_upload_part.call_count, 0)
+        self.assertEqual(self.mock_finish_upload.call_count, 0)
+        self.assertEqual(
+            "Item id: 1 is cut in 3 parts of 2 bytes but the API expects 1 "
+            "parts",
+            self.mock_handler.error[0]
+        )
+
 
-class TestFileUploadChunks(TestCase):
+class TestFileUploadChunks(PatchersMixin, TempFileMixin, TestCase):
     """
     Test class to host all tests for reading part in chunks inside the
     upload method of File class in items package.
     """
-    def setUp(self):
-        finish_response = FakeResponse(ok=True)
-
-        mock.patch(
-            "wetransfer.api_requests.FinishUpload.create",
-            response_value=finish_response
-        ).start()
-        self.mock_upload_part = mock.patch(
-            "wetransfer.items.File.upload_part",
-            response_value=True
-        ).start()
+    @classmethod
+    def make_patchers(cls):
+        cls.mock_upload_part = mock.Mock(return_value=True)
+        return [
+            mock.patch(
+                "wetransfer.api_requests.FinishUpload.create",
+                return_value=FakeResponse(ok=True)
+            ),
+            mock.patch(
+                "wetransfer.items.File.upload_part",
+                new=recording_upload_part(cls.mock_upload_part)
+            ),
+        ]
 
-        self.temp_file = tempfile.NamedTemporaryFile()
-        with open(self.temp_file.name, 'w') as f:
-            f.write("123456")
+    def setUp(self):
+        self.mock_upload_part.reset_mock()
 
         self.item = File(self.temp_file.name)
         self.item.client_options = {}
         self.item.id = 1
-
-    def tearDown(self):
-        mock.patch.stopall()
+        # Upload parts one at a time so calls are made in order
+        self.item.MAX_WORKERS = 1
 
     def test_upload_chunks(self):
         """
         Tests the usecase where chunk size is smaller than size of file.
         """
-        self.item.CHUNK_SIZE = 2
+        self.set_chunk_size(self.item, 2)
         r = self.item.upload()
         self.assertEqual(self.mock_upload_part.call_count, 3)
         expected_call_list = [
-            mock.call('12', 1), mock.call('34', 2), mock.call('56', 3),
+            mock.call(b'12', 1), mock.call(b'34', 2), mock.call(b'56', 3),
         ]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
@@ -255,12 +505,12 @@ class TestFileUploadChunks(TestCase):
         """
         Tests the usecase where chunk size is smaller than size of file.
         """
-        self.item.CHUNK_SIZE = 1
+        self.set_chunk_size(self.item, 1)
         r = self.item.upload()
         self.assertEqual(self.mock_upload_part.call_count, 6)
         expected_call_list = [
-            mock.call('1', 1), mock.call('2', 2), mock.call('3', 3),
-            mock.call('4', 4), mock.call('5', 5), mock.call('6', 6)
+            mock.call(b'1', 1), mock.call(b'2', 2), mock.call(b'3', 3),
+            mock.call(b'4', 4), mock.call(b'5', 5), mock.call(b'6', 6)
         ]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
@@ -272,10 +522,10 @@ class TestFileUploadChunks(TestCase):
         """
         Tests the usecase where chunk size is smaller than size of file.
         """
-        self.item.CHUNK_SIZE = 3
+        self.set_chunk_size(self.item, 3)
         r = self.item.upload()
         self.assertEqual(self.mock_upload_part.call_count, 2)
-        expected_call_list = [mock.call('123', 1), mock.call('456', 2)]
+        expected_call_list = [mock.call(b'123', 1), mock.call(b'456', 2)]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
             expected_call_list
@@ -286,10 +536,10 @@ class TestFileUploadChunks(TestCase):
         """
         Tests the usecase where chunk size is smaller than size of file.
         """
-        self.item.CHUNK_SIZE = 4
+        self.set_chunk_size(self.item, 4)
         r = self.item.upload()
         self.assertEqual(self.mock_upload_part.call_count, 2)
-        expected_call_list = [mock.call('1234', 1), mock.call('56', 2)]
+        expected_call_list = [mock.call(b'1234', 1), mock.call(b'56', 2)]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
             expected_call_list
@@ -300,10 +550,10 @@ class TestFileUploadChunks(TestCase):
         """
         Tests the usecase where chunk size is smaller than size of file.
         """
-        self.item.CHUNK_SIZE = 5
+        self.set_chunk_size(self.item, 5)
         r = self.item.upload()
         self.assertEqual(self.mock_upload_part.call_count, 2)
-        expected_call_list = [mock.call('12345', 1), mock.call('6', 2)]
+        expected_call_list = [mock.call(b'12345', 1), mock.call(b'6', 2)]
         self.assertEqual(
             self.mock_upload_part.call_args_list,
             expected_call_list
@@ -314,10 +564,10 @@ class TestFileUploadChunks(TestCase):
         """
         Tests the usecase where chunk size is equal to the size of file.
         """
-        self.item.CHUNK_SIZE = 6
+        self.set_chunk_size(self.item, 6)
         r = self.item.upload()
         self.mock_upload_part.assert_called_once_with(
-          "123456", 1
+          b"123456", 1
         )
         self.assertTrue(r)
 
@@ -325,10 +575,10 @@ class TestFileUploadChunks(TestCase):
         """
         Tests the usecase where chunk size is bigger than size of file.
         """
-        self.item.CHUNK_SIZE = 7
+        self.set_chunk_size(self.item, 7)
         r = self.item.upload()
         self.mock_upload_part.assert_called_once_with(
-          "123456", 1
+          b"123456", 1
         )
         self.assertTrue(r)
 
@@ -336,39 +586,140 @@ class TestFileUploadChunks(TestCase):
         """
         Tests the usecase where chunk size is bigger than size of file.
         """
-        self.item.CHUNK_SIZE = 30
+        self.set_chunk_size(self.item, 30)
         r = self.item.upload()
         self.mock_upload_part.assert_called_once_with(
-          "123456", 1
+          b"123456", 1
         )
         self.assertTrue(r)
 
+    def test_read_parts(self):
+        """
+        Tests the parts are numbered from 1 and cover the file exactly once,
+        with one part per started chunk, for chunk sizes around the file size.
+        """
+        for chunk_size in range(1, 8):
+            self.item.CHUNK_SIZE = chunk_size
+            part_numbers, parts = zip(
+                *self.item._read_parts(memoryview(b"123456"))
+            )
+            self.assertEqual(len(parts), -(-6 // chunk_size))
+            self.assertEqual(part_numbers, tuple(range(1, len(parts) + 1)))
+            self.assertEqual(b"".join(parts), b"123456")
+
+    def test_upload_chunks_zero_copy(self):
+        """
+        Tests the usecase where chunks are handed over as read-only views of
+        the file instead of bytes copies.
+        """
+        parts = []
+
+        def upload_part(item, part, part_number):
+            parts.append((type(part), part.readonly))
+            return True
+
+        self.set_chunk_size(self.item, 4)
+        with mock.patch("wetransfer.items.File.upload_part", new=upload_part):
+            self.assertTrue(self.item.upload())
+        self.assertEqual(parts, [(memoryview, True)] * 2)
+
+    def test_upload_chunks_map_closed(self):
+        """
+        Tests the memory map of the file and the views over it are released
+        once the upload is done, whether it succeeded or failed.
+        """
+        maps, mmap_type = [], mmap.mmap
+
+        def create_map(*args, **kwargs):
+            maps.append(mmap_type(*args, **kwargs))
+            return maps[-1]
+
+        parts = []
 
-class TestFileUploadPart(TestCase):
+        def upload_part(item, part, part_number):
+            parts.append(part)
+            return part_number != 2
+
+        self.set_chunk_size(self.item, 2)
+        with mock.patch("wetransfer.items.mmap.mmap", new=create_map), \
+                mock.patch("wetransfer.items.File.upload_part", new=upload_part):
+            self.assertFalse(self.item.upload())
+        self.assertEqual(len(maps), 1)
+        self.assertTrue(maps[0].closed)
+        self.assertEqual(len(parts), 2)
+        for part in parts:
+            self.assertRaises(ValueError, bytes, part)
+
+    def test_upload_chunks_without_madvise(self):
+        """
+        Tests the usecase where the platform can't advise the kernel on how
+        the file is read.
+        """
+        self.set_chunk_size(self.item, 4)
+        with mock.patch("wetransfer.items._MADV_SEQUENTIAL", None):
+            r = self.item.upload()
+        expected_call_list = [mock.call(b'1234', 1), mock.call(b'56', 2)]
+        self.assertEqual(
+            self.mock_upload_part.call_args_list,
+            expected_call_list
+        )
+        self.assertTrue(r)
+
+    def test_upload_chunks_binary(self):
+        """
+        Tests the usecase where the file holds line endings and non utf-8
+        bytes, which must be uploaded unchanged.
+        """
+        binary_file = tempfile.NamedTemporaryFile()
+        self.addCleanup(binary_file.close)
+        binary_file.write(b"\r\n\xff\x00\n\r")
+        binary_file.flush()
+        item = File(binary_file.name, chunk_size=3)
+        item.client_options = {}
+        item.id = 1
+        item.multipart_parts = 2
+        item.MAX_WORKERS = 1
+        r = item.upload()
+        expected_call_list = [
+            mock.call(b'\r\n\xff', 1), mock.call(b'\x00\n\r', 2)
+        ]
+        self.assertEqual(
+            self.mock_upload_part.call_args_list,
+            expected_call_list
+        )
+        self.assertTrue(r)
+
+
+class TestFileUploadPart(PatchersMixin, TempFileMixin, TestCase):
     """
     Test class to host all tests for  'upload_part' method of File class in
     items package.
     """
 
+    @classmethod
+    def make_patchers(cls):
+        return [
+            mock.patch("wetransfer.items.get_upload_url"),
+            mock.patch("wetransfer.items.put_part"),
+        ]
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestFileUploadPart, cls).setUpClass()
+        cls.mock_get_upload_url, cls.mock_upload_part = cls.mocks
+
     def setUp(self):
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
         self.mock_handler = MockLoggingHandler()
         LOGGER.addHandler(self.mock_handler)
-        finish_response = FakeResponse(ok=True)
-        self.mock_get_upload_url = mock.patch(
-            "wetransfer.api_requests.GetUploadURL.create"
-        ).start()
-        self.mock_upload_part = mock.patch(
-            "wetransfer.api_requests.UploadPart.create"
-        ).start()
-        self.temp_file = tempfile.NamedTemporaryFile()
-        with open(self.temp_file.name, 'w') as f:
-            f.write("123456")
+        self.mock_get_upload_url.reset_mock(return_value=True, side_effect=True)
+        self.mock_upload_part.reset_mock(return_value=True, side_effect=True)
         self.item = File(self.temp_file.name)
         self.item.client_options = {}
         self.item.id = 1
 
+    def tearDown(self):
+        LOGGER.removeHandler(self.mock_handler)
+
     def test_upload_part1(self):
         """
         Tests the usecase where everything is fine and there is no errors from
@@ -383,14 +734,55 @@ class TestFileUploadPart(TestCase):
         self.assertEqual(self.mock_upload_part.call_count, 1)
         self.assertEqual(
             "Successfully fetched url for item id: 1, upload_id: None, part_number: 1",
-            self.mock_handler.messages["info"][0]
+            self.mock_handler.info[0]
         )
         self.assertEqual(
             "Successfully PUT-ed part-number 1 for item id: 1",
-            self.mock_handler.messages["info"][1]
+            self.mock_handler.info[1]
         )
         self.assertTrue(res)
 
+    def test_upload_part_arguments(self):
+        """
+        Tests the API calls for a part are made with the part url, the client
+        headers and session, and the upload url we got back
+        """
+        r = FakeResponse(ok=True)
+        self.mock_get_upload_url.return_value = r
+        self.mock_upload_part.return_value = r
+        session = mock.Mock()
+        headers = {"header1": "test1"}
+        self.item.client_options = {
+            "session": session, "headers_prebuilt": headers
+        }
+        self.item.multipart_upload_id = "upload_id"
+        self.item.upload_part(b"as", 2)
+        self.mock_get_upload_url.assert_called_once_with(
+            "https://dev.wetransfer.com/v1/files/1/uploads/2/upload_id",
+            headers, session
+        )
+        self.mock_upload_part.assert_called_once_with(
+            "test_dummy_url", b"as", session
+        )
+
+    def test_part_url(self):
+        """
+        Tests the url to fetch the upload URL of a part from is built from the
+        file details and the client options
+        """
+        self.item.multipart_upload_id = "upload_id"
+        self.assertEqual(
+            self.item._part_url(2),
+            "https://dev.wetransfer.com/v1/files/1/uploads/2/upload_id"
+        )
+        self.item.load_info(
+            client_options={"base_url": "https://dummy_server"}, id=3
+        )
+        self.assertEqual(
+            self.item._part_url(1),
+            "https://dummy_server/v1/files/3/uploads/1/upload_id"
+        )
+
     def test_upload_part2(self):
         """
         Tests the usecase where GetUploadURL call returns an error and the
@@ -406,7 +798,7 @@ class TestFileUploadPart(TestCase):
         self.assertEqual(self.mock_upload_part.call_count, 0)
         self.assertEqual(
             "Failed fetching url for item id: 1, upload_id: None, part_number: 1",
-            self.mock_handler.messages["error"][0]
+            self.mock_handler.error[0]
         )
         self.assertFalse(res)
 
@@ -425,11 +817,11 @@ class TestFileUploadPart(TestCase):
         self.assertEqual(self.mock_upload_part.call_count, 1)
         self.assertEqual(
             "Successfully fetched url for item id: 1, upload_id: None, part_number: 1",
-            self.mock_handler.messages["info"][0]
+            self.mock_handler.info[0]
         )
         self.assertEqual(
             "Failed PUT-ing part-number 1 for item id: 1",
-            self.mock_handler.messages["error"][0]
+            self.mock_handler.error[0]
         )
         self.assertFalse(res)
 
@@ -447,7 +839,7 @@ class TestFileUploadPart(TestCase):
         self.assertEqual(self.mock_upload_part.call_count, 0)
         self.assertEqual(
             "Failed fetching url for item id: 1, upload_id: None, part_number: 1",
-            self.mock_handler.messages["error"][0]
+            self.mock_handler.error[0]
         )
         self.assertFalse(res)
 
@@ -472,6 +864,7 @@ class TestLinkItem(TestCase):
             "url": self.item.url
         }
         self.assertEqual(self.item.serialize(), expected_value)
+        self.assertIs(self.item.serialize(), self.item.serialize())
 
     def test__get_hex_repr(self):
         """
@@ -493,13 +886,7 @@ class TestLinkItem(TestCase):
 
     def test_str(self):
         """Tests the '__str__' representation of the objects of Link class"""
-        regexp = (
-            r"Transfer item, link type, with title \S+ \S+, url \S+ and local "
-            r"identifier \S+"
-        )
-        pattern = re.compile(regexp)
-        is_match = pattern.match(str(self.item))
-        self.assertTrue(is_match)
+        self.assertTrue(_LINK_STR_PATTERN.match(str(self.item)))
 
     def test_init(self):
         """
@@ -513,10 +900,21 @@ class TestLinkItem(TestCase):
         self.assertEqual(item.content_identifier, "web_content")
         self.assertEqual(item.url, url)
         self.assertEqual(item.title, title)
-        if six.PY2:
-            self.assertEqual(item.local_identifier, url.encode("hex")[-34:])
-        else:
-            self.assertEqual(item.local_identifier, url.encode("utf-8").hex()[-34:])
+        self.assertEqual(item.local_identifier, url.encode("utf-8").hex()[-34:])
+
+    def test_local_identifier_computed_once(self):
+        """
+        Tests the local identifier is computed once, when the Link is created,
+        and only read afterwards.
+        """
+        with mock.patch.object(
+            Link, "_get_hex_repr", autospec=True,
+            side_effect=Link._get_hex_repr
+        ) as mock_hex:
+            item = Link("http://dummy.url", "Dummy Title")
+            item.serialize()
+            str(item)
+            mock_hex.assert_called_once_with(item, "http://dummy.url")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,143 @@
+"""Module that implements tests for wetransfer logger module."""
+import logging
+import threading
+from unittest import main, TestCase
+
+from wetransfer.logger import LOGGER, buffered_logging
+
+
+class RecordingHandler(logging.Handler):
+    """Logging handler keeping the messages it handles, in order."""
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+        logging.Handler.__init__(self, *args, **kwargs)
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestBufferedLogging(TestCase):
+    """Test class to host tests for buffered_logging context manager."""
+
+    def setUp(self):
+        LOGGER.setLevel(logging.DEBUG)
+        self.handler = RecordingHandler()
+        LOGGER.addHandler(self.handler)
+        self.root_handler = RecordingHandler()
+        logging.getLogger().addHandler(self.root_handler)
+
+    def tearDown(self):
+        LOGGER.removeHandler(self.handler)
+        logging.getLogger().removeHandler(self.root_handler)
+
+    def test_flush_on_exit(self):
+        with buffered_logging():
+            LOGGER.info("first")
+            LOGGER.debug("second")
+            self.assertEqual(self.handler.messages, [])
+            self.assertEqual(self.root_handler.messages, [])
+
+        self.assertEqual(self.handler.messages, ["first", "second"])
+        self.assertEqual(self.root_handler.messages, ["first", "second"])
+
+    def test_flush_on_capacity(self):
+        with buffered_logging(capacity=2):
+            LOGGER.info("first")
+            self.assertEqual(self.handler.messages, [])
+            LOGGER.info("second")
+            self.assertEqual(self.handler.messages, ["first", "second"])
+            LOGGER.info("third")
+
+        self.assertEqual(self.handler.messages, ["first", "second", "third"])
+
+    def test_flush_on_level(self):
+        with buffered_logging():
+            LOGGER.info("first")
+            LOGGER.error("second")
+            self.assertEqual(self.handler.messages, ["first", "second"])
+
+    def test_handler_level(self):
+        self.handler.setLevel(logging.WARNING)
+        with buffered_logging():
+            LOGGER.info("first")
+            LOGGER.warning("second")
+
+        self.assertEqual(self.handler.messages, ["second"])
+        self.assertEqual(self.root_handler.messages, ["first", "second"])
+
+    def test_no_propagate(self):
+        LOGGER.propagate = False
+        self.addCleanup(setattr, LOGGER, "propagate", True)
+        with buffered_logging():
+            LOGGER.info("first")
+
+        self.assertEqual(self.handler.messages, ["first"])
+        self.assertEqual(self.root_handler.messages, [])
+
+    def test_restored(self):
+        handlers = LOGGER.handlers
+        with buffered_logging():
+            self.assertNotIn(self.handler, LOGGER.handlers)
+            self.assertFalse(LOGGER.propagate)
+
+        self.assertIs(LOGGER.handlers, handlers)
+        self.assertTrue(LOGGER.propagate)
+
+    def test_restored_on_error(self):
+        handlers = LOGGER.handlers
+        with self.assertRaises(ValueError):
+            with buffered_logging():
+                LOGGER.info("first")
+                raise ValueError()
+
+        self.assertIs(LOGGER.handlers, handlers)
+        self.assertEqual(self.handler.messages, ["first"])
+
+    def test_overlapping(self):
+        handlers = LOGGER.handlers
+        first, second = buffered_logging(), buffered_logging(capacity=1)
+        first.__enter__()
+        LOGGER.info("first")
+        second.__enter__()
+        LOGGER.info("second")
+        first.__exit__(None, None, None)
+        LOGGER.info("third")
+        self.assertEqual(self.handler.messages, [])
+        second.__exit__(None, None, None)
+
+        self.assertIs(LOGGER.handlers, handlers)
+        self.assertTrue(LOGGER.propagate)
+        self.assertEqual(self.handler.messages, ["first", "second", "third"])
+        LOGGER.info("fourth")
+        self.assertEqual(self.handler.messages[-1], "fourth")
+
+    def test_threads(self):
+        handlers = LOGGER.handlers
+        entered, release = threading.Barrier(3), threading.Event()
+
+        def upload(number):
+            with buffered_logging():
+                LOGGER.info("thread %s", number)
+                entered.wait()
+                release.wait()
+
+        threads = [
+            threading.Thread(target=upload, args=(n,)) for n in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        entered.wait()
+        self.assertEqual(self.handler.messages, [])
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertIs(LOGGER.handlers, handlers)
+        self.assertEqual(
+            sorted(self.handler.messages), ["thread 0", "thread 1"]
+        )
+
+
+if __name__ == '__main__':
+    main()
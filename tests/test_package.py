@@ -0,0 +1,64 @@
+"""Module that implements tests for the wetransfer package namespace."""
+import os
+import sys
+import subprocess
+from unittest import main, TestCase
+
+import wetransfer
+from wetransfer.client import WTApiClient
+from wetransfer.items import File, Link
+from wetransfer.transfer import Transfer
+
+
+def run_python(code, **env_vars):
+    """Runs code in a fresh interpreter and returns its stripped output"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    env.pop("WT_EAGER_IMPORT", None)
+    env.update(env_vars)
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+    return output.decode().strip()
+
+
+class TestPackage(TestCase):
+    """Test class to host tests for the lazy public namespace of the package"""
+
+    def test_public_attributes(self):
+        """Tests public classes are the ones defined in the submodules"""
+        self.assertIs(wetransfer.WTApiClient, WTApiClient)
+        self.assertIs(wetransfer.Transfer, Transfer)
+        self.assertIs(wetransfer.File, File)
+        self.assertIs(wetransfer.Link, Link)
+        self.assertEqual(set(wetransfer.__all__) - set(dir(wetransfer)), set())
+
+    def test_unknown_attribute(self):
+        """Tests accessing an unknown attribute raises AttributeError"""
+        self.assertRaises(AttributeError, getattr, wetransfer, "Dummy")
+
+    def test_lazy_import(self):
+        """Tests importing the package doesn't import its submodules"""
+        code = (
+            "import sys, wetransfer; "
+            "print('wetransfer.client' in sys.modules)"
+        )
+        if sys.version_info >= (3, 7):
+            self.assertEqual(run_python(code), "False")
+
+    def test_eager_import(self):
+        """Tests WT_EAGER_IMPORT imports everything with the package"""
+        code = (
+            "import sys, wetransfer; "
+            "print('wetransfer.client' in sys.modules)"
+        )
+        self.assertEqual(run_python(code, WT_EAGER_IMPORT="1"), "True")
+
+    def test_import_without_six(self):
+        """Tests that the SDK, Python 3 only, never imports six"""
+        code = (
+            "import sys, wetransfer.client, wetransfer.transfer; "
+            "print('six' in sys.modules)"
+        )
+        self.assertEqual(run_python(code), "False")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Module that implements tests for wetransfer token_cache module."""
+import os
+import json
+import mock
+import shutil
+import tempfile
+from unittest import main, TestCase
+
+from wetransfer.logger import LOGGER
+from wetransfer.token_cache import TokenCache
+
+
+class TestTokenCache(TestCase):
+    """Test class to host main tests for TokenCache class."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "wetransfer", "tokens.json")
+        self.cache = TokenCache(path=self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_default_path(self):
+        """Tests the cache file lives under $XDG_CACHE_HOME when set"""
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/dummy"}):
+            self.assertEqual(
+                TokenCache.default_path(), "/dummy/wetransfer/tokens.json"
+            )
+            self.assertEqual(TokenCache().path, "/dummy/wetransfer/tokens.json")
+
+    def test_get_missing(self):
+        """Tests get returns None when there is no cache file yet"""
+        self.assertIsNone(self.cache.get("dummy_key", "https://dummy_server"))
+
+    def test_set_get(self):
+        """Tests a stored token is returned for the same key and server only"""
+        self.cache.set("dummy_key", "https://dummy_server", "dummy_token")
+        self.assertEqual(
+            self.cache.get("dummy_key", "https://dummy_server"), "dummy_token"
+        )
+        self.assertIsNone(self.cache.get("other_key", "https://dummy_server"))
+        self.assertIsNone(self.cache.get("dummy_key", "https://other_server"))
+
+        with open(self.path) as f:
+            self.assertNotIn("dummy_key", f.read())
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_set_get_bare_path(self):
+        """Tests a cache file given as a bare file name is written"""
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.addCleanup(os.chdir, cwd)
+        cache = TokenCache(path="tokens.json")
+        cache.set("dummy_key", "https://dummy_server", "dummy_token")
+        self.assertEqual(
+            cache.get("dummy_key", "https://dummy_server"), "dummy_token"
+        )
+        self.assertEqual(os.listdir(self.temp_dir), ["tokens.json"])
+
+    def test_get_expired(self):
+        """Tests get ignores expired tokens and set drops them"""
+        cache = TokenCache(path=self.path, ttl=-1)
+        cache.set("dummy_key", "https://dummy_server", "dummy_token")
+        self.assertIsNone(cache.get("dummy_key", "https://dummy_server"))
+
+        self.cache.set("other_key", "https://dummy_server", "other_token")
+        with open(self.path) as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+    def test_get_corrupt(self):
+        """Tests a corrupt cache file is treated as empty"""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("not json")
+        self.assertIsNone(self.cache.get("dummy_key", "https://dummy_server"))
+
+        self.cache.set("dummy_key", "https://dummy_server", "dummy_token")
+        self.assertEqual(
+            self.cache.get("dummy_key", "https://dummy_server"), "dummy_token"
+        )
+
+    def test_get_malformed_entries(self):
+        """Tests entries that are not a token and expiry time are dropped"""
+        os.makedirs(os.path.dirname(self.path))
+        key = TokenCache.cache_key("dummy_key", "https://dummy_server")
+        other_key = TokenCache.cache_key("other_key", "https://dummy_server")
+        with open(self.path, "w") as f:
+            json.dump({
+                key: "dummy_token",
+                other_key: {"token": "other_token", "expires": True},
+                "third": {"token": 1, "expires": 1},
+            }, f)
+        self.assertIsNone(self.cache.get("dummy_key", "https://dummy_server"))
+        self.assertIsNone(self.cache.get("other_key", "https://dummy_server"))
+
+        self.cache.set("dummy_key", "https://dummy_server", "dummy_token")
+        self.assertEqual(
+            self.cache.get("dummy_key", "https://dummy_server"), "dummy_token"
+        )
+        with open(self.path) as f:
+            self.assertEqual(list(json.load(f)), [key])
+
+    def test_delete(self):
+        """Tests a deleted token is no longer returned, others are kept"""
+        self.cache.set("dummy_key", "https://dummy_server", "dummy_token")
+        self.cache.set("other_key", "https://dummy_server", "other_token")
+        self.cache.delete("dummy_key", "https://dummy_server")
+        self.assertIsNone(self.cache.get("dummy_key", "https://dummy_server"))
+        self.assertEqual(
+            self.cache.get("other_key", "https://dummy_server"), "other_token"
+        )
+        self.cache.delete("missing_key", "https://dummy_server")
+
+    def test_set_failure(self):
+        """Tests failing to write the cache is logged and not raised"""
+        with mock.patch("os.replace", side_effect=OSError("dummy error")), \
+                self.assertLogs(LOGGER, "WARNING") as logs:
+            self.cache.set("dummy_key", "https://dummy_server", "dummy_token")
+        self.assertTrue(
+            logs.records[0].getMessage().startswith("Failed writing token cache")
+        )
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [])
+
+
+if __name__ == '__main__':
+    main()
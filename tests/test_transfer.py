@@ -1,14 +1,24 @@
 """Module that implements tests for wetransfer transfer module."""
 import os
+import json
 import re
 import mock
 import logging
 import tempfile
+from collections import deque
 from unittest import skip, main, TestCase
 from wetransfer.transfer import Transfer
 from wetransfer.items import File, Link
 from wetransfer.logger import LOGGER
 
+# Shared by every FakeResponse, none of the tests mutates it
+_TRANSFER_FAKE_JSON = {"id": "dummy_id", "shortened_url": "dummy_url"}
+
+
+def setUpModule():
+    logging.basicConfig()
+    logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
+
 
 class MockLoggingHandler(logging.Handler):
     """Mock logging handler to check for expected logs."""
@@ -18,16 +28,19 @@ class MockLoggingHandler(logging.Handler):
         logging.Handler.__init__(self, *args, **kwargs)
 
     def emit(self, record):
-        self.messages[record.levelname.lower()].append(record.getMessage())
+        # Standard levels are multiples of 10, DEBUG (10) to CRITICAL (50)
+        self._buckets[record.levelno // 10].append(record.getMessage())
 
     def reset(self):
-        self.messages = {
-            'debug': [],
-            'info': [],
-            'warning': [],
-            'error': [],
-            'critical': [],
-        }
+        self.debug = deque()
+        self.info = deque()
+        self.warning = deque()
+        self.error = deque()
+        self.critical = deque()
+        self._buckets = (
+            None, self.debug, self.info, self.warning, self.error,
+            self.critical
+        )
 
 
 class FakeResponse(object):
@@ -39,7 +52,11 @@ class FakeResponse(object):
         self.ok = ok
 
     def json(self):
-        return {"id": "dummy_id", "shortened_url": "dummy_url"}
+        return _TRANSFER_FAKE_JSON
+
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode("utf-8")
 
 
 class TestTransfer(TestCase):
@@ -53,11 +70,12 @@ class TestTransfer(TestCase):
             "key": self.key, "token": self.token, "server": self.server, "name": self.name
         })
 
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
         self.mock_handler = MockLoggingHandler()
         LOGGER.addHandler(self.mock_handler)
 
+    def tearDown(self):
+        LOGGER.removeHandler(self.mock_handler)
+
     def test_init(self):
         """
         Tests the init method of the class and checks if needed properties
@@ -65,7 +83,11 @@ class TestTransfer(TestCase):
         """
         self.assertEqual(
             self.transfer.client_options,
-            {"key": self.key, "token": self.token, "server": self.server, "name": "Dummy Transfer"}
+            {
+                "key": self.key, "token": self.token, "server": self.server,
+                "name": "Dummy Transfer", "session": None, "base_url": None,
+                "headers_prebuilt": None
+            }
         )
         self.assertEqual(self.transfer.transfer_id, None)
         self.assertEqual(self.transfer.transfer_items, [])
@@ -82,7 +104,7 @@ class TestTransfer(TestCase):
             r = self.transfer.create()
             self.assertEqual(
                 "Successfully created new transfer",
-                self.mock_handler.messages["info"][0]
+                self.mock_handler.info[0]
             )
             self.assertEqual(self.transfer.transfer_id, "dummy_id")
             self.assertEqual(self.transfer.shortened_url, "dummy_url")
@@ -99,7 +121,7 @@ class TestTransfer(TestCase):
             r = self.transfer.create()
             self.assertEqual(
                 "Failed creating new transfer",
-                self.mock_handler.messages["error"][0]
+                self.mock_handler.error[0]
             )
             # None of the below properties should be set
             self.assertEqual(self.transfer.transfer_id, None)
@@ -107,7 +129,31 @@ class TestTransfer(TestCase):
 
             self.assertFalse(r)
 
-    def test_validate_add_items_response_success(self):
+    def test_add_files(self):
+        """
+        Tests the `add_files` method adds File items for the given paths with
+        the given chunk size.
+        """
+        temp_file = tempfile.NamedTemporaryFile()
+        with mock.patch('wetransfer.transfer.Transfer.add_items') as mock_add:
+            mock_add.return_value = True
+            r = self.transfer.add_files(temp_file.name)
+            self.assertTrue(r)
+            items = mock_add.call_args[0][0]
+            self.assertEqual(len(items), 1)
+            self.assertEqual(items[0].local_identifier, temp_file.name)
+            self.assertEqual(items[0].CHUNK_SIZE, 6291456)
+            self.assertEqual(items[0].MAX_WORKERS, 4)
+
+            self.transfer.add_files(
+                [temp_file.name] * 2, chunk_size=10, max_workers=1
+            )
+            items = mock_add.call_args[0][0]
+            self.assertEqual(len(items), 2)
+            self.assertEqual(items[1].CHUNK_SIZE, 10)
+            self.assertEqual(items[1].MAX_WORKERS, 1)
+
+    def test__validate_add_items_response_success(self):
         """
         Tests the `validate_add_items` method in cases where everything goes
         fine.
@@ -126,24 +172,37 @@ class TestTransfer(TestCase):
         ]
         fake_res = FakeAddItemsResponse(ok=True, response=add_items_response)
         self.transfer.transfer_items = add_items_response
-        res = self.transfer.validate_add_items_response(fake_res)
-        self.assertTrue(res)
+        res = self.transfer._validate_add_items_response(fake_res)
+        self.assertEqual(res, add_items_response)
 
-    def test_validate_add_items_response_fail1(self):
+    def test_validate_add_items_response(self):
+        """
+        Tests the public `validate_add_items_response` method returns whether
+        the response is valid.
+        """
+        self.transfer.transfer_items = [1]
+        fake_res = FakeAddItemsResponse(ok=True, response=[1])
+        self.assertIs(self.transfer.validate_add_items_response(fake_res), True)
+        fake_res = FakeAddItemsResponse(ok=True, response=[1, 2])
+        self.assertIs(self.transfer.validate_add_items_response(fake_res), False)
+        fake_res = FakeAddItemsResponse(ok=False, response=[1])
+        self.assertIs(self.transfer.validate_add_items_response(fake_res), False)
+
+    def test__validate_add_items_response_fail1(self):
         """
         Tests the `validate_add_items` method in cases where `AddItems` API
         call has failed and we return False.
         """
         add_items_response = []
         fake_res = FakeAddItemsResponse(ok=False, response=add_items_response)
-        res = self.transfer.validate_add_items_response(fake_res)
-        self.assertFalse(res)
+        res = self.transfer._validate_add_items_response(fake_res)
+        self.assertIsNone(res)
         self.assertEqual(
             "Failed to add items: [] to transfer None",
-            self.mock_handler.messages["error"][0]
+            self.mock_handler.error[0]
         )
 
-    def test_validate_add_items_response_fail2(self):
+    def test__validate_add_items_response_fail2(self):
         """
         Tests the `validate_add_items` method in cases where response has more
         items than the ones we send.
@@ -151,33 +210,158 @@ class TestTransfer(TestCase):
         add_items_response = [1, 2]
         fake_res = FakeAddItemsResponse(ok=True, response=add_items_response)
         self.transfer.transfer_items = add_items_response + [3]
-        res = self.transfer.validate_add_items_response(fake_res)
-        self.assertFalse(res)
+        res = self.transfer._validate_add_items_response(fake_res)
+        self.assertIsNone(res)
         self.assertEqual(
             "Add items API call didn't return same number of items (2) than what we sent (3)",
-            self.mock_handler.messages["error"][0]
+            self.mock_handler.error[0]
         )
 
+    def test_add_items_parse_once(self):
+        """
+        Tests the `add_items` method parses the AddItems response body only
+        once.
+        """
+        link = Link("http://dummy.url", "Dummy Title")
+        response = FakeAddItemsResponse(ok=True, response=[
+            {"content_identifier": "web_content", "id": "dummy_id1"}
+        ])
+        with mock.patch('wetransfer.api_requests.AddItems.create') as mock_create, \
+                mock.patch('wetransfer.transfer.Transfer.upload_items') as mock_upload, \
+                mock.patch('wetransfer.transfer.response_json') as mock_json:
+            mock_create.return_value = response
+            mock_upload.return_value = True
+            mock_json.return_value = response.response
+            r = self.transfer.add_items([link])
+            self.assertTrue(r)
+            mock_json.assert_called_once_with(response)
+
+    def test_add_items_twice(self):
+        """
+        Tests that a second add_items call only sends and uploads the items
+        it adds, not the ones added by the first call.
+        """
+        temp_file1 = tempfile.NamedTemporaryFile()
+        temp_file2 = tempfile.NamedTemporaryFile()
+        f1 = File(temp_file1.name)
+        f2 = File(temp_file2.name)
+        link = Link("http://dummy.url", "Dummy Title")
+        meta = {"multipart_parts": "dummy", "multipart_upload_id": "dummy"}
+        responses = [
+            [
+                {"content_identifier": "file", "id": "dummy_id1", "meta": meta},
+                {"content_identifier": "web_content", "id": "dummy_id2"},
+            ],
+            [{"content_identifier": "file", "id": "dummy_id3", "meta": meta}],
+        ]
+        with mock.patch('wetransfer.transfer.AddItems') as mock_add, \
+                mock.patch('wetransfer.transfer.response_json') as mock_json, \
+                mock.patch.object(File, 'upload', autospec=True) as mock_upload:
+            mock_add.return_value.create.return_value = FakeAddItemsResponse()
+            mock_json.side_effect = responses
+            mock_upload.return_value = True
+
+            self.assertTrue(self.transfer.add_items([f1, link]))
+            self.assertEqual(mock_add.call_args[1]["items"], [f1, link])
+            self.assertEqual(mock_upload.call_args_list, [mock.call(f1)])
+
+            self.assertTrue(self.transfer.add_items([f2]))
+            self.assertEqual(mock_add.call_args[1]["items"], [f2])
+            self.assertEqual(
+                mock_upload.call_args_list, [mock.call(f1), mock.call(f2)]
+            )
+
+        self.assertEqual(self.transfer.transfer_items, [f1, link, f2])
+        self.assertEqual(self.transfer.transfer_files, [f1, f2])
+        self.assertEqual(f1.id, "dummy_id1")
+        self.assertEqual(f2.id, "dummy_id3")
+
+    def test_add_items_retry(self):
+        """
+        Tests that items a failed add_items call could not add are sent again
+        by the next call.
+        """
+        link1 = Link("http://dummy.url", "Dummy Title")
+        link2 = Link("http://other.url", "Other Title")
+        with mock.patch('wetransfer.transfer.AddItems') as mock_add, \
+                mock.patch('wetransfer.transfer.response_json') as mock_json:
+            mock_add.return_value.create.side_effect = [
+                FakeAddItemsResponse(ok=False), FakeAddItemsResponse()
+            ]
+            mock_json.return_value = [
+                {"content_identifier": "web_content", "id": "dummy_id1"},
+                {"content_identifier": "web_content", "id": "dummy_id2"},
+            ]
+            self.assertFalse(self.transfer.add_items([link1]))
+            self.assertTrue(self.transfer.add_items([link2]))
+            self.assertEqual(mock_add.call_args[1]["items"], [link1, link2])
+
+
+class PatchersMixin(object):
+    """
+    Mixin starting the patchers make_patchers returns once for all the tests
+    of a class, their mocks in order in mocks, and stopping them afterwards.
+    """
+
+    @classmethod
+    def make_patchers(cls):
+        """Returns the patchers to start for the tests of the class."""
+        return []
+
+    @classmethod
+    def setUpClass(cls):
+        super(PatchersMixin, cls).setUpClass()
+        cls.patchers = cls.make_patchers()
+        cls.mocks = [patcher.start() for patcher in cls.patchers]
+
+    @classmethod
+    def tearDownClass(cls):
+        for patcher in reversed(cls.patchers):
+            patcher.stop()
+        super(PatchersMixin, cls).tearDownClass()
+
 
 class FakeAddItemsResponse(object):
     """
     Mock response object from the different API calls that we do inside Item
     classes
     """
-    def __init__(self, ok=True, response=[]):
+    def __init__(self, ok=True, response=None):
         self.ok = ok
-        self.response = response
+        self.response = [] if response is None else response
 
     def json(self):
         return self.response
 
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode("utf-8")
 
-class TestTransferAddItems(TestCase):
+
+class TestTransferAddItems(PatchersMixin, TestCase):
     """
     Test class to host all tests for 'add_items' method of Transfer class in transfer
     package.
     """
 
+    @classmethod
+    def make_patchers(cls):
+        return [
+            mock.patch("wetransfer.api_requests.AddItems.create"),
+            mock.patch("wetransfer.transfer.Transfer.upload_items"),
+            mock.patch(
+                "wetransfer.transfer.Transfer._validate_add_items_response"
+            ),
+        ]
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestTransferAddItems, cls).setUpClass()
+        (
+            cls.mock_add_items, cls.mock_upload_part,
+            cls.mock_validate_add_items
+        ) = cls.mocks
+
     def setUp(self):
         self.key = "dummy_key"
         self.token = "dummy_token"
@@ -187,20 +371,17 @@ class TestTransferAddItems(TestCase):
             "key": self.key, "token": self.token, "server": self.server, "name": self.name
         })
 
-        logging.basicConfig()
-        logging.getLogger("wetransfer-python-sdk").setLevel(logging.DEBUG)
         self.mock_handler = MockLoggingHandler()
         LOGGER.addHandler(self.mock_handler)
 
-        self.mock_add_items = mock.patch(
-            "wetransfer.api_requests.AddItems.create",
-        ).start()
-        self.mock_upload_part = mock.patch(
-            "wetransfer.transfer.Transfer.upload_items",
-        ).start()
-        self.mock_validate_add_items = mock.patch(
-            "wetransfer.transfer.Transfer.validate_add_items_response",
-        ).start()
+        for mock_method in (
+            self.mock_add_items, self.mock_upload_part,
+            self.mock_validate_add_items
+        ):
+            mock_method.reset_mock(return_value=True, side_effect=True)
+
+    def tearDown(self):
+        LOGGER.removeHandler(self.mock_handler)
 
     def test_add_items1(self):
         """
@@ -208,7 +389,7 @@ class TestTransferAddItems(TestCase):
         validate method returns false.
         """
         items = [1, 2]
-        self.mock_validate_add_items.return_value = False
+        self.mock_validate_add_items.return_value = None
         self.mock_upload_part.return_value = True
         self.mock_add_items.return_value = None
         r = self.transfer.add_items(items)
@@ -255,12 +436,13 @@ class TestTransferAddItems(TestCase):
             },
         ]
         self.mock_upload_part.return_value = True
+        self.mock_validate_add_items.return_value = add_items_response
         self.mock_add_items.return_value = FakeAddItemsResponse(
             ok=True, response=add_items_response)
         r = self.transfer.add_items(items)
         self.assertTrue(r)
         self.assertTrue(
-            self.mock_handler.messages["info"][0].startswith(
+            self.mock_handler.info[0].startswith(
                 "Successfully added items:")
         )
         self.assertEqual(len(self.transfer.transfer_items), 4)
@@ -276,7 +458,8 @@ class TestTransferAddItems(TestCase):
         """Checks if File objects properties are set as expected"""
         client_options = {
             "token": "dummy_token", "key": "dummy_key",
-            "server": "dummy_server", "name": "Dummy Transfer"
+            "server": "dummy_server", "name": "Dummy Transfer",
+            "session": None, "base_url": None, "headers_prebuilt": None
         }
         for index, item in enumerate(self.transfer.transfer_items):
             if item.content_identifier == "web_content":
@@ -289,9 +472,6 @@ class TestTransferAddItems(TestCase):
 
         return True
 
-    def tearDown(self):
-        mock.patch.stopall()
-
 
 if __name__ == "__main__":
     main()